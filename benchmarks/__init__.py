@@ -0,0 +1,63 @@
+"""
+Benchmarks for the join backend.
+
+Every benchmark module can be run on its own, e.g.::
+
+    python -m benchmarks.subtask_create
+
+The benchmarks run against a throwaway test database, so ``db.sqlite3`` is
+never touched. Apply ``makemigrations`` first, as described in the README.
+"""
+import os
+from contextlib import contextmanager
+
+
+def setup():
+    """
+    Configure Django for a benchmark run outside of manage.py.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'join_backend.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """
+    Create the test databases for the duration of the block and destroy them afterwards.
+    """
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+    )
+    setup_test_environment()
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity)
+        teardown_test_environment()
+
+
+def populate_board(task_count):
+    """
+    Create a user with token and `task_count` tasks with assigned contacts and
+    subtasks. Returns the token key.
+    """
+    from rest_framework.authtoken.models import Token
+    from users.models import CustomUser
+    from contacts.models import Contact
+    from tasks.models import Task
+    from subtasks.models import Subtask
+
+    user = CustomUser.objects.create_user(username='benchmark', email='benchmark@mail.com', password='benchmark')
+    contacts = Contact.objects.bulk_create([Contact(name=f'Contact {i}', email=f'contact{i}@mail.com') for i in range(10)])
+    tasks = Task.objects.bulk_create([
+        Task(title=f'Task {i}', description='Benchmark', due_date='2030-01-01', category='Technical Task')
+        for i in range(task_count)
+    ])
+    Task.assigned_to.through.objects.bulk_create([
+        Task.assigned_to.through(task_id=task.pk, contact_id=contacts[i % len(contacts)].pk)
+        for i, task in enumerate(tasks)
+    ])
+    Subtask.objects.bulk_create([Subtask(task=task, description='Subtask') for task in tasks for _ in range(3)])
+    return Token.objects.create(user=user).key
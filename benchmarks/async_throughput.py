@@ -0,0 +1,170 @@
+"""
+Compare the throughput of the task and contact read endpoints served by the
+WSGI application in a thread pool with the ASGI application on an event loop.
+
+Both applications are called in-process, without a web server, so the
+numbers reflect the handlers and views only. They share the URLconf, which
+has the async views enabled as under asgi.py. Run with
+``DJANGO_ASYNC_VIEWS=false`` to measure the WSGI application with the
+synchronous views it is deployed with.
+
+Usage::
+
+    python -m benchmarks.async_throughput [--requests 500] [--concurrency 1 10 50] [--tasks 100]
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from . import setup, test_database, populate_board
+
+
+def wsgi_request(application, url, token):
+    """
+    Call the WSGI application with a GET request and return the status code.
+    """
+    from wsgiref.util import setup_testing_defaults
+
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': parts.path,
+        'QUERY_STRING': parts.query,
+        'HTTP_HOST': 'testserver',
+        'HTTP_AUTHORIZATION': f'Token {token}',
+        'wsgi.input': io.BytesIO(),
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b''.join(body)
+    finally:
+        body.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_request(application, url, token=None, method='GET', body=b''):
+    """
+    Call the ASGI application and return the status code. A body is sent as JSON.
+    """
+    parts = urlsplit(url)
+    headers = [(b'host', b'testserver')]
+    if token:
+        headers.append((b'authorization', f'Token {token}'.encode()))
+    if body:
+        headers += [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'headers': headers,
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if not messages:
+            messages.append(None)
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            messages.append(message['status'])
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return messages[1]
+
+
+def run_wsgi(urls, token, concurrency):
+    """
+    Serve the requests with the WSGI application in `concurrency` threads.
+    Returns the elapsed time and the latencies.
+    """
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def timed(url):
+        start = time.perf_counter()
+        assert wsgi_request(application, url, token) == 200
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = list(executor.map(timed, urls))
+    return time.perf_counter() - start, latencies
+
+
+def run_asgi(urls, token, concurrency):
+    """
+    Serve the requests with the ASGI application, `concurrency` at a time.
+    Returns the elapsed time and the latencies.
+    """
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(url):
+            async with semaphore:
+                start = time.perf_counter()
+                assert await asgi_request(application, url, token) == 200
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(timed(url) for url in urls))
+        return time.perf_counter() - start, latencies
+
+    return asyncio.run(main())
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--tasks', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_ASYNC_VIEWS', 'true')
+    setup()
+    from django.urls import reverse
+
+    with test_database():
+        token = populate_board(args.tasks)
+        endpoints = [reverse('task-list'), reverse('task-detail', args=[1]), reverse('contact-list')]
+        urls = [endpoints[i % len(endpoints)] for i in range(args.requests)]
+
+        print(f"{'server':>6} {'concurrency':>12} {'requests/s':>11} {'p50':>9} {'p95':>9}")
+        for concurrency in args.concurrency:
+            for name, run in (('wsgi', run_wsgi), ('asgi', run_asgi)):
+                elapsed, latencies = run(urls, token, concurrency)
+                print(
+                    f'{name:>6} {concurrency:>12} {len(urls) / elapsed:>11.1f} '
+                    f'{percentile(latencies, 0.5) * 1000:>7.2f}ms {percentile(latencies, 0.95) * 1000:>7.2f}ms'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+"""
+Benchmark every API route in-process against seeded boards of increasing
+size, and compare the results with a stored baseline.
+
+For every endpoint and board size the benchmark records the latency
+percentiles, the number of queries and the peak memory allocated while
+handling the request. Requests go through the WSGI handler with all
+middleware, using Django's test client. Boards are generated by seed_board
+with a fixed seed and date, so runs on the same code are comparable.
+
+Write the results as JSON with ``--output`` and pass an earlier result file as
+``--baseline`` to compare: the run fails with exit code 1 if an endpoint needs
+more queries than allowed by ``--query-threshold``, or its median latency or
+peak memory grew by more than ``--latency-threshold`` or
+``--memory-threshold`` (relative, 0.25 = 25%). Every run times a fixed CPU
+workload and the baseline latencies are scaled by the ratio of both timings,
+which evens out a machine that is busier than when the baseline was recorded.
+Latency baselines are still only meaningful on the machine they were recorded
+on.
+
+Usage::
+
+    python -m benchmarks.endpoints [--sizes 100 1000 10000] [--repeat 20] [--only task-list login]
+        [--output results.json] [--baseline baseline.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date
+
+from . import setup, test_database
+
+SEED = 1
+TODAY = date(2024, 6, 1)
+
+# routes that can't be benchmarked as a single request
+EXCLUDED_ROUTES = {
+    'board-events': 'streams until the client disconnects and is only served via ASGI',
+}
+
+
+class Board:
+    """
+    The seeded board of a run with an authenticated client and the ids the
+    endpoints refer to.
+
+    Attributes:
+        size (int): Number of seeded tasks.
+        client (APIClient): Client authenticated as the first seeded user.
+        user: The first seeded user, a staff user with the password `password`.
+        task_id, subtask_id, contact_id (int): Objects that are read and updated.
+        revision (int): Revision of the change log after seeding.
+    """
+
+    def __init__(self, size):
+        from rest_framework.authtoken.models import Token
+        from rest_framework.test import APIClient
+        from contacts.models import Contact
+        from subtasks.models import Subtask
+        from sync.models import Change
+        from tasks.models import Task
+        from tasks.seeding import BoardSeeder
+        from users.models import CustomUser
+
+        BoardSeeder(seed=SEED, today=TODAY).seed_board(users=max(2, size // 100), contacts=max(10, size // 10), tasks=size)
+        self.size = size
+        self.user = CustomUser.objects.order_by('pk').first()
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.task_id = Task.objects.order_by('pk').values_list('pk', flat=True)[size // 2]
+        self.subtask_id = Subtask.objects.order_by('pk').values_list('pk', flat=True).first()
+        self.contact_id = Contact.objects.filter(active_user=None).order_by('pk').values_list('pk', flat=True).first()
+        self.revision = Change.objects.order_by('pk').values_list('pk', flat=True).last() or 0
+        self.counter = 0
+
+
+    def unique(self):
+        """
+        Return a new number per call, e.g. for unique emails.
+        """
+        self.counter += 1
+        return self.counter
+
+
+    def task_data(self):
+        return {
+            'title': f'Benchmark task {self.unique()}', 'description': 'Created by the benchmark', 'status': 'to-do',
+            'priority': 2, 'due_date': '2024-07-01', 'category': 'Technical Task', 'assigned_to': [self.contact_id],
+            'subtasks': [{'description': 'First', 'is_done': False}, {'description': 'Second', 'is_done': True}],
+        }
+
+
+    def new_task(self):
+        from tasks.models import Task
+        return Task.objects.create(title='To delete', description='', due_date=TODAY, category='User Story')
+
+
+    def new_contact(self):
+        from contacts.models import Contact
+        return Contact.objects.create(name='To delete', email='delete@example.com')
+
+
+class Endpoint:
+    """
+    A request of the benchmark.
+
+    `prepare(board)` runs before every request without being timed and returns
+    the path and the body of the request, e.g. after creating the object a
+    DELETE request removes.
+    """
+
+    def __init__(self, name, route, method, prepare, status=200):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.prepare = prepare
+        self.status = status
+
+
+def url(route, *args, **kwargs):
+    from django.urls import reverse
+    return reverse(route, args=args, kwargs=kwargs)
+
+
+ENDPOINTS = [
+    Endpoint('api-root', 'api-root', 'get', lambda board: (url('api-root'), None)),
+    Endpoint('task-list', 'task-list', 'get', lambda board: (url('task-list'), None)),
+    Endpoint('task-detail', 'task-detail', 'get', lambda board: (url('task-detail', board.task_id), None)),
+    Endpoint('task-create', 'task-list', 'post', lambda board: (url('task-list'), board.task_data()), 201),
+    Endpoint('task-update', 'task-detail', 'patch', lambda board: (url('task-detail', board.task_id), {'title': f'Updated {board.unique()}'})),
+    Endpoint('task-delete', 'task-detail', 'delete', lambda board: (url('task-detail', board.new_task().pk), None), 204),
+    Endpoint('task-bulk', 'task-bulk', 'post', lambda board: (url('task-bulk'), {
+        'create': [board.task_data() for _ in range(10)], 'update': [{'id': board.task_id, 'status': 'done'}], 'delete': [],
+    })),
+    Endpoint('task-summary', 'task-summary', 'get', lambda board: (url('task-summary'), None)),
+    Endpoint('task-export', 'task-export', 'get', lambda board: (url('task-export', export_format='ndjson'), None)),
+    Endpoint('subtask-list', 'subtask-list', 'get', lambda board: (url('subtask-list'), None)),
+    Endpoint('subtask-detail', 'subtask-detail', 'get', lambda board: (url('subtask-detail', board.subtask_id), None)),
+    Endpoint('subtask-create', 'subtask-list', 'post', lambda board: (url('subtask-list'), {'task': board.task_id, 'description': 'New', 'is_done': False}), 201),
+    Endpoint('subtask-update', 'subtask-detail', 'patch', lambda board: (url('subtask-detail', board.subtask_id), {'is_done': board.unique() % 2 == 0})),
+    Endpoint('subtask-delete', 'subtask-detail', 'delete', lambda board: (url('subtask-detail', board.new_task().subtasks.create(description='To delete').pk), None), 204),
+    Endpoint('contact-list', 'contact-list', 'get', lambda board: (url('contact-list'), None)),
+    Endpoint('contact-detail', 'contact-detail', 'get', lambda board: (url('contact-detail', board.contact_id), None)),
+    Endpoint('contact-create', 'contact-list', 'post', lambda board: (url('contact-list'), {'name': 'New Contact', 'email': f'new{board.unique()}@example.com'}), 201),
+    Endpoint('contact-update', 'contact-detail', 'patch', lambda board: (url('contact-detail', board.contact_id), {'phone': str(board.unique())})),
+    Endpoint('contact-delete', 'contact-detail', 'delete', lambda board: (url('contact-detail', board.new_contact().pk), None), 204),
+    Endpoint('contact-import', 'contact-import-contacts', 'post', lambda board: (url('contact-import-contacts'), [
+        {'name': f'Imported {i}', 'email': f'imported{board.unique()}@example.com'} for i in range(100)
+    ]), 201),
+    Endpoint('user-list', 'user-list', 'get', lambda board: (url('user-list'), None)),
+    Endpoint('user-detail', 'user-detail', 'get', lambda board: (url('user-detail', board.user.pk), None)),
+    Endpoint('user-update', 'user-detail', 'patch', lambda board: (url('user-detail', board.user.pk), {'phone': str(board.unique())})),
+    Endpoint('login', 'login', 'post', lambda board: (url('login'), {'email': board.user.email, 'password': 'password'})),
+    Endpoint('register', 'register', 'post', lambda board: (url('register'), {
+        'email': f'registered{board.unique()}@example.com', 'username': 'Registered User', 'password': 'benchmark-password',
+    }), 201),
+    Endpoint('sync', 'sync', 'get', lambda board: (f"{url('sync')}?since={board.revision}", None)),
+    Endpoint('request-metrics', 'request-metrics', 'get', lambda board: (url('request-metrics'), None)),
+]
+
+
+def api_routes():
+    """
+    Return the names of all routes below /api/.
+    """
+    from django.urls import URLPattern, get_resolver
+
+    names = set()
+
+    def collect(patterns, prefix):
+        for pattern in patterns:
+            if isinstance(pattern, URLPattern):
+                if prefix.startswith('api/') and pattern.name:
+                    names.add(pattern.name)
+            else:
+                collect(pattern.url_patterns, prefix + str(pattern.pattern))
+
+    collect(get_resolver().url_patterns, '')
+    return names
+
+
+def send(board, endpoint, path, data):
+    """
+    Send the request of the endpoint and return the response with its content read.
+    """
+    method = getattr(board.client, endpoint.method)
+    response = method(path, data, format='json') if data is not None else method(path)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    assert response.status_code == endpoint.status, f'{endpoint.name}: {response.status_code} {getattr(response, "data", "")}'
+    return response
+
+
+def count_queries(board, endpoint):
+    """
+    Return the number of queries of one request, on all databases.
+    """
+    from django.db import connections
+    from django.test.utils import CaptureQueriesContext
+
+    path, data = endpoint.prepare(board)
+    unique_connections = {id(connections[alias]): connections[alias] for alias in connections}
+    with ExitStack() as stack:
+        contexts = [stack.enter_context(CaptureQueriesContext(connection)) for connection in unique_connections.values()]
+        send(board, endpoint, path, data)
+    return sum(len(context) for context in contexts)
+
+
+def measure_memory(board, endpoint):
+    """
+    Return the peak memory in KiB allocated while handling one request.
+    """
+    path, data = endpoint.prepare(board)
+    tracemalloc.start()
+    try:
+        send(board, endpoint, path, data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure(board, endpoint, repeat):
+    """
+    Return the results of the endpoint: latency percentiles in ms, queries and peak memory.
+    """
+    send(board, endpoint, *endpoint.prepare(board)) # warm up
+    queries = count_queries(board, endpoint)
+    memory = measure_memory(board, endpoint)
+    timings = []
+    for _ in range(repeat):
+        path, data = endpoint.prepare(board)
+        start = time.perf_counter()
+        send(board, endpoint, path, data)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'endpoint': endpoint.name,
+        'size': board.size,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'queries': queries,
+        'peak_memory_kib': round(memory, 1),
+    }
+
+
+def calibrate(repeat=20):
+    """
+    Return the best time in ms of a fixed CPU-bound workload, a measure of how
+    fast the machine is at the moment.
+    """
+    data = [{'id': i, 'title': f'Task {i}', 'subtasks': list(range(i % 5))} for i in range(2000)]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(json.dumps(data))
+        sorted(data, key=lambda task: task['title'])
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def compare(baseline, results, calibration_ms, latency_threshold, memory_threshold, query_threshold, latency_floor_ms):
+    """
+    Return the regressions of the results against the baseline as messages.
+
+    Latency is compared by the median. The baseline latencies are scaled by
+    the ratio of the calibrations of both runs, so a machine that is slower at
+    the moment doesn't report regressions. Differences below
+    `latency_floor_ms` are treated as noise. Endpoints missing in either run
+    are skipped.
+    """
+    previous = {(result['endpoint'], result['size']): result for result in baseline['results']}
+    speed = calibration_ms / baseline['calibration_ms']
+    regressions = []
+    for result in results:
+        before = previous.get((result['endpoint'], result['size']))
+        if before is None:
+            continue
+        name = f"{result['endpoint']} @ {result['size']} tasks"
+        if result['queries'] > before['queries'] + query_threshold:
+            regressions.append(f"{name}: {result['queries']} queries, baseline {before['queries']}")
+        expected_ms = before['p50_ms'] * speed
+        if result['p50_ms'] - expected_ms > latency_floor_ms and result['p50_ms'] > expected_ms * (1 + latency_threshold):
+            regressions.append(f"{name}: median {result['p50_ms']:.2f}ms, baseline {expected_ms:.2f}ms adjusted to the machine speed")
+        if result['peak_memory_kib'] > before['peak_memory_kib'] * (1 + memory_threshold):
+            regressions.append(f"{name}: peak memory {result['peak_memory_kib']:.0f}KiB, baseline {before['peak_memory_kib']:.0f}KiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Numbers of seeded tasks.')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed requests per endpoint and size.')
+    parser.add_argument('--only', nargs='+', help='Names of the endpoints to run, all by default.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare with the results in this file.')
+    parser.add_argument('--latency-threshold', type=float, default=0.25)
+    parser.add_argument('--memory-threshold', type=float, default=0.25)
+    parser.add_argument('--query-threshold', type=int, default=0, help='Additional queries allowed.')
+    parser.add_argument('--latency-floor-ms', type=float, default=2.0, help='Latency growth always tolerated.')
+    args = parser.parse_args(argv)
+
+    setup()
+    import django
+    from django.core.cache import caches
+    from django.core.management import call_command
+
+    uncovered = api_routes() - {endpoint.route for endpoint in ENDPOINTS} - set(EXCLUDED_ROUTES)
+    if uncovered:
+        print(f"Routes without benchmark: {', '.join(sorted(uncovered))}", file=sys.stderr)
+    for route, reason in EXCLUDED_ROUTES.items():
+        print(f'Skipping {route}: {reason}', file=sys.stderr)
+    endpoints = [endpoint for endpoint in ENDPOINTS if not args.only or endpoint.name in args.only]
+
+    results = []
+    calibration_before = calibrate()
+    print(f"{'endpoint':>15} {'tasks':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'memory':>10}")
+    with test_database():
+        for size in args.sizes:
+            # start every size with an empty database and caches
+            call_command('flush', interactive=False, verbosity=0)
+            for cache in caches.all():
+                cache.clear()
+            board = Board(size)
+            for endpoint in endpoints:
+                result = measure(board, endpoint, args.repeat)
+                results.append(result)
+                print(
+                    f"{endpoint.name:>15} {size:>6} {result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms "
+                    f"{result['p99_ms']:>7.2f}ms {result['queries']:>8} {result['peak_memory_kib']:>7.0f}KiB"
+                )
+    # the machine speed at the start and the end, so drift during the run is averaged
+    calibration_ms = (calibration_before + calibrate()) / 2
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'machine': platform.machine(),
+                'repeat': args.repeat,
+                'calibration_ms': calibration_ms,
+                'results': results,
+            }, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, results, calibration_ms, args.latency_threshold, args.memory_threshold, args.query_threshold, args.latency_floor_ms)
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print('No regressions against the baseline.')
+
+
+if __name__ == '__main__':
+    main()
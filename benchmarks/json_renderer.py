@@ -0,0 +1,59 @@
+"""
+Compare rendering and parsing task lists with DRF's JSONRenderer and
+JSONParser and with the orjson based FastJSONRenderer and FastJSONParser.
+
+Usage::
+
+    python -m benchmarks.json_renderer [--rows 100 1000] [--repeat 20]
+"""
+import argparse
+import io
+import time
+
+from . import setup, test_database, populate_board
+
+
+def best_of(repeat, func, *args):
+    """
+    Return the best time in seconds of `repeat` calls of func(*args).
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from join_backend.parsers import FastJSONParser
+    from join_backend.renderers import FastJSONRenderer
+    from tasks.serializers import TaskSerializer
+    from tasks.views import TaskViewSet
+
+    with test_database():
+        populate_board(max(args.rows))
+        print(f"{'tasks':>6} {'':>7} {'stdlib':>11} {'orjson':>11} {'speedup':>9}")
+        for rows in args.rows:
+            data = TaskSerializer(TaskViewSet.queryset.order_by('pk')[:rows], many=True).data
+            content = JSONRenderer().render(data)
+            assert FastJSONRenderer().render(data) == content
+
+            render = best_of(args.repeat, JSONRenderer().render, data)
+            fast_render = best_of(args.repeat, FastJSONRenderer().render, data)
+            parse = best_of(args.repeat, lambda: JSONParser().parse(io.BytesIO(content)))
+            fast_parse = best_of(args.repeat, lambda: FastJSONParser().parse(io.BytesIO(content)))
+            print(f'{rows:>6} {"render":>7} {render * 1000:>9.2f}ms {fast_render * 1000:>9.2f}ms {render / fast_render:>8.1f}x')
+            print(f'{rows:>6} {"parse":>7} {parse * 1000:>9.2f}ms {fast_parse * 1000:>9.2f}ms {parse / fast_parse:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Measure login throughput and the latency of other requests during a burst of
+logins, served by the ASGI application.
+
+Each run compares hashing on the request thread, as the synchronous
+LoginView did, with hashing in the password hashing pool, for PBKDF2 and
+scrypt. While the logins run, a second client keeps requesting the contact
+list; its p95 latency shows how much the logins hold up other requests.
+
+Usage::
+
+    python -m benchmarks.login_throughput [--logins 40] [--concurrency 1 8 32]
+"""
+import argparse
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from . import setup, test_database, populate_board
+from .async_throughput import asgi_request, percentile
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+
+
+async def login_burst(application, logins, concurrency, token):
+    """
+    Send `logins` logins, `concurrency` at a time, while requesting the contact
+    list in a loop. Returns the elapsed time and the contact list latencies.
+    """
+    from django.urls import reverse
+
+    body = json.dumps({'email': 'benchmark@mail.com', 'password': 'benchmark'}).encode()
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    latencies = []
+
+    async def login():
+        async with semaphore:
+            assert await asgi_request(application, reverse('login'), method='POST', body=body) == 200
+
+    async def read():
+        while not done.is_set():
+            start = time.perf_counter()
+            assert await asgi_request(application, reverse('contact-list'), token) == 200
+            latencies.append(time.perf_counter() - start)
+
+    reader = asyncio.create_task(read())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await reader
+    return elapsed, latencies
+
+
+def run(logins, concurrency, token, pooled):
+    """
+    Run a login burst, with the hashing in the pool or on the request thread.
+    """
+    from asgiref.sync import sync_to_async
+    from django.core.asgi import get_asgi_application
+    from users.views import LoginView
+
+    async def apost_on_request_thread(self, request, *args, **kwargs):
+        return await sync_to_async(self.post)(request, *args, **kwargs)
+
+    application = get_asgi_application()
+    if pooled:
+        return asyncio.run(login_burst(application, logins, concurrency, token))
+    with patch.object(LoginView, 'apost', apost_on_request_thread):
+        return asyncio.run(login_burst(application, logins, concurrency, token))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--logins', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.conf import settings
+    from django.test import override_settings
+    from users.models import CustomUser
+
+    with test_database():
+        token = populate_board(10)
+        print(f"{'hasher':>7} {'hashing':>14} {'concurrency':>12} {'logins/s':>9} {'p95 other':>10}")
+        for name, hasher in HASHERS.items():
+            hashers = [hasher] + [other for other in settings.PASSWORD_HASHERS if other != hasher]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                user = CustomUser.objects.get(email='benchmark@mail.com')
+                user.set_password('benchmark')
+                user.save()
+                for concurrency in args.concurrency:
+                    for pooled in (False, True):
+                        elapsed, latencies = run(args.logins, concurrency, token, pooled)
+                        print(
+                            f"{name:>7} {'pool' if pooled else 'request thread':>14} {concurrency:>12} "
+                            f'{args.logins / elapsed:>9.1f} {percentile(latencies, 0.95) * 1000:>8.1f}ms'
+                        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare creating users one by one with create_user, whose post_save signal
+adds the contact, with bulk provisioning by users.provisioning.
+
+Password hashing usually dominates and scales with the number of CPUs. Run
+with ``--hasher md5`` to measure the database work alone.
+
+Usage::
+
+    python -m benchmarks.provision_users [--users 200] [--workers 4] [--hasher scrypt|md5]
+"""
+import argparse
+import time
+
+from . import setup, test_database
+
+HASHERS = {
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'md5': 'django.contrib.auth.hashers.MD5PasswordHasher',
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--hasher', choices=HASHERS, default='scrypt')
+    args = parser.parse_args(argv)
+
+    setup()
+    from django.test import override_settings
+    from users.models import CustomUser
+    from users.provisioning import provision_users
+
+    def rows(prefix):
+        return [
+            {'email': f'{prefix}{i}@mail.com', 'username': f'User {i}', 'password': f'password{i}'}
+            for i in range(args.users)
+        ]
+
+    with test_database(), override_settings(PASSWORD_HASHERS=[HASHERS[args.hasher]]):
+        start = time.perf_counter()
+        for row in rows('single'):
+            CustomUser.objects.create_user(**row)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        users, errors = provision_users(rows('bulk'), workers=args.workers)
+        bulk = time.perf_counter() - start
+        assert len(users) == args.users and not errors
+
+        print(f"{'users':>6} {'create_user':>12} {'provision':>11} {'speedup':>9}")
+        print(f'{args.users:>6} {single:>11.2f}s {bulk:>10.2f}s {single / bulk:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare serializing list pages with the model serializers and with the
+values-based read serializers used with FAST_READ_SERIALIZERS.
+
+Every run includes the queries of the page. The representation cache of
+TaskSerializer is cleared before each run, so the model serializers start
+cold. The rendered JSON of both paths is compared before timing.
+
+Usage::
+
+    python -m benchmarks.read_serializers [--rows 100 1000] [--repeat 5]
+"""
+import argparse
+import time
+
+from . import setup, test_database, populate_board
+
+
+def get_serializers():
+    """
+    Return (name, queryset, model serializer class, values serializer class) per list endpoint.
+    """
+    from tasks.views import TaskViewSet
+    from subtasks.views import SubtaskViewSet
+    from contacts.views import ContactViewSet
+    from users.views import CustomUserViewSet
+
+    return [
+        (viewset.__name__.removesuffix('ViewSet'), viewset.queryset.order_by('pk'), viewset.serializer_class, viewset.values_serializer_class)
+        for viewset in (TaskViewSet, SubtaskViewSet, ContactViewSet, CustomUserViewSet)
+    ]
+
+
+def serialize_models(queryset, serializer_class, rows):
+    return serializer_class(list(queryset[:rows]), many=True).data
+
+
+def serialize_values(queryset, serializer_class, rows):
+    serializer = serializer_class()
+    return serializer.to_representation(serializer.get_rows(queryset)[:rows])
+
+
+def measure(serialize, queryset, serializer_class, rows, repeat):
+    """
+    Return the best time in seconds to serialize `rows` rows.
+    """
+    from django.core.cache import cache
+
+    timings = []
+    for _ in range(repeat):
+        cache.clear()
+        start = time.perf_counter()
+        serialize(queryset, serializer_class, rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def populate(rows):
+    """
+    Create at least `rows` tasks, subtasks, contacts and users.
+    """
+    from contacts.models import Contact
+    from users.models import CustomUser
+
+    populate_board(rows)
+    CustomUser.objects.bulk_create([
+        CustomUser(username=f'User {i}', email=f'user{i}@mail.com', initials='US', password='!')
+        for i in range(rows)
+    ])
+    Contact.objects.bulk_create([Contact(name=f'Contact {i}', email=f'more{i}@mail.com') for i in range(rows)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+
+    with test_database():
+        populate(max(args.rows))
+        print(f"{'serializer':>12} {'rows':>6} {'model':>11} {'values':>11} {'speedup':>9}")
+        for name, queryset, model_serializer, values_serializer in get_serializers():
+            for rows in args.rows:
+                model_data = serialize_models(queryset, model_serializer, rows)
+                values_data = serialize_values(queryset, values_serializer, rows)
+                assert JSONRenderer().render(model_data) == JSONRenderer().render(values_data), f'{name} output differs'
+
+                model = measure(serialize_models, queryset, model_serializer, rows, args.repeat)
+                values = measure(serialize_values, queryset, values_serializer, rows, args.repeat)
+                print(f'{name:>12} {rows:>6} {model * 1000:>9.2f}ms {values * 1000:>9.2f}ms {model / values:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
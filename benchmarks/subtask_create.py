@@ -0,0 +1,67 @@
+"""
+Compare creating the nested Subtasks of a Task row by row with the bulk
+insert used by TaskSerializer.create.
+
+Usage::
+
+    python -m benchmarks.subtask_create [--sizes 10 100 1000] [--repeat 5]
+"""
+import argparse
+import time
+
+from . import setup, test_database
+
+
+def create_row_by_row(task, subtasks_data):
+    """
+    The previous TaskSerializer.create path: one INSERT per subtask.
+    """
+    from subtasks.models import Subtask
+    for subtask_data in subtasks_data:
+        Subtask.objects.create(task=task, **subtask_data)
+
+
+def create_bulk(task, subtasks_data):
+    """
+    The current TaskSerializer.create path: a single bulk INSERT.
+    """
+    from tasks.serializers import TaskSerializer
+    TaskSerializer().create_subtasks(task, subtasks_data)
+
+
+def measure(create, size, repeat):
+    """
+    Return the best time in seconds to create `size` subtasks with `create`.
+    """
+    from django.db import transaction
+    from tasks.models import Task
+
+    subtasks_data = [{'description': f'Subtask {i}', 'is_done': i % 2 == 0} for i in range(size)]
+    timings = []
+    for _ in range(repeat):
+        with transaction.atomic():
+            task = Task.objects.create(title='Benchmark', description='Benchmark', due_date='2030-01-01', category='Technical Task')
+            start = time.perf_counter()
+            create(task, subtasks_data)
+            timings.append(time.perf_counter() - start)
+            transaction.set_rollback(True)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup()
+    with test_database():
+        print(f"{'subtasks':>10} {'row by row':>12} {'bulk':>12} {'speedup':>9}")
+        for size in args.sizes:
+            row_by_row = measure(create_row_by_row, size, args.repeat)
+            bulk = measure(create_bulk, size, args.repeat)
+            print(f'{size:>10} {row_by_row * 1000:>10.2f}ms {bulk * 1000:>10.2f}ms {row_by_row / bulk:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,33 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from users.models import CustomUser
 from users.utils import generate_initials
+from join_backend.managers import BulkSignalQuerySet
 import random
 
+
+class ContactQuerySet(BulkSignalQuerySet):
+    """
+    QuerySet for Contacts that fills in the generated fields on bulk creation.
+    """
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Generate initials and assign random badge colors for the whole batch, as
+        Contact.save does for a single contact, then insert the contacts.
+        Badge colors that are already set are kept.
+        """
+        objs = list(objs)
+        initials = {name: generate_initials(name) for name in {contact.name for contact in objs}}
+        contacts_without_color = [contact for contact in objs if contact.badge_color is None]
+        badge_colors = random.choices(range(15), k=len(contacts_without_color))
+        
+        for contact, badge_color in zip(contacts_without_color, badge_colors):
+            contact.badge_color = badge_color
+        for contact in objs:
+            contact.initials = initials[contact.name]
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 # Create your models here.
 class Contact(models.Model):
     """
@@ -18,6 +43,7 @@ class Contact(models.Model):
         phone (str): The phone number of the contact.
         badge_color (int): An integer representing the badge color, randomly assigned at creation.
         active_user (CustomUser): A one-to-one relationship with the active user associated with this contact.
+        updated_at (datetime): Time of the last change, set automatically.
     """
     
     name = models.CharField(max_length=100)
@@ -26,6 +52,9 @@ class Contact(models.Model):
     phone = models.CharField(max_length=15, blank=True, null=True)
     badge_color = models.PositiveSmallIntegerField(validators=[MinValueValidator(0), MaxValueValidator(14)], blank=True)
     active_user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, null=True, blank=True, related_name='contact') 
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = ContactQuerySet.as_manager()
     
     
     def __str__(self):
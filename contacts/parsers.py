@@ -0,0 +1,27 @@
+import codecs
+import csv
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class CSVParser(BaseParser):
+    """
+    Parses CSV request bodies into a list of dicts, one per row.
+
+    The first row has to contain the column names, e.g. `name,email,phone`.
+    """
+    media_type = 'text/csv'
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Parse the incoming CSV stream and return a list of rows.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        
+        try:
+            reader = csv.DictReader(codecs.getreader(encoding)(stream))
+            return [{key.strip(): value for key, value in row.items() if key} for row in reader]
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ParseError(f'CSV parse error - {exc}')
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from join_backend.serializers import TimedSerializerMixin, ValuesSerializer
 from .models import Contact
 
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Contact model, converting instances to/from JSON.
 
@@ -21,3 +22,10 @@ class ContactSerializer(serializers.ModelSerializer):
             'initials' : {'read_only' : True},
             'badge_color' : {'read_only' : True},
             }
+
+
+class ContactValuesSerializer(ValuesSerializer):
+    """
+    Read-only serializer with the output of ContactSerializer, built from values rows.
+    """
+    fields = ['id', 'name', 'initials', 'email', 'phone', 'badge_color', 'active_user']
@@ -1,15 +1,28 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import pre_delete, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
+from tasks.models import Task
 from .models import Contact     
         
 
+@receiver(pre_delete, sender=Contact)
+def touch_assigned_tasks(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered before a Contact instance is deleted.
+
+    This function marks all tasks assigned to the contact as updated with a single
+    query, as they lose an assignee, so their ETags change.
+    """
+    Task.objects.filter(assigned_to=instance).update(updated_at=timezone.now())
+
+
 @receiver(post_delete, sender=Contact)
 def remove_contact_from_tasks(sender, instance, **kwargs):
     """
     Signal handler that is triggered after a Contact instance is deleted.
 
-    This function removes the deleted contact from all tasks to which it was assigned.
+    This function removes the deleted contact from all tasks to which it was assigned
+    with a single delete on the assignment table. The deletion cascade usually removed
+    these rows already, so this only catches assignments left behind.
     """
-    tasks = instance.tasks.all()
-    for task in tasks:
-        task.assigned_to.remove(instance)
\ No newline at end of file
+    Contact.tasks.through.objects.filter(contact_id=instance.pk).delete()
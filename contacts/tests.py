@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -5,6 +6,8 @@ from users.models import CustomUser
 from tasks.models import Task
 from .models import Contact
 from rest_framework.authtoken.models import Token
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 class ContactsAPITests(APITestCase):
     
@@ -149,10 +152,10 @@ class ContactsAPITests(APITestCase):
         url = reverse('contact-list')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
-        self.assertEqual(response.data[0]['name'], 'contact_user')
-        self.assertEqual(response.data[1]['name'], 'contact_other_user')
-        self.assertEqual(response.data[2]['name'], 'contact_no_user')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['name'], 'contact_user')
+        self.assertEqual(response.data['results'][1]['name'], 'contact_other_user')
+        self.assertEqual(response.data['results'][2]['name'], 'contact_no_user')
     
     
     def test_user_can_get_contact_detail(self):
@@ -212,4 +215,139 @@ class ContactsAPITests(APITestCase):
         task_with_contact.refresh_from_db()
         
         self.assertEqual(Contact.objects.filter(id=self.contact_user.pk).first(), None)
-        self.assertNotIn(self.contact_user, task_with_contact.assigned_to.all())
\ No newline at end of file
+        self.assertNotIn(self.contact_user, task_with_contact.assigned_to.all())
+        
+    
+    def test_contact_deletion_query_count_is_constant(self):
+        """
+        Ensure deleting a contact costs the same number of queries regardless of the number of assigned tasks.
+        """
+        self.client.get(reverse('contact-list')) # caches the token, so both deletes authenticate alike
+        
+        def delete_contact(task_count):
+            contact = Contact.objects.create(name='assigned contact', email='assigned@mail.com')
+            tasks = Task.objects.bulk_create([
+                Task(title=f'Task {i}', description='Test Description', priority=1, due_date='2030-07-22', category='Technical Task')
+                for i in range(task_count)
+            ])
+            contact.tasks.add(*tasks)
+            url = reverse('contact-detail', kwargs={'pk' : contact.pk})
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.delete(url)
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            self.assertFalse(Task.assigned_to.through.objects.filter(contact_id=contact.pk).exists())
+            return len(queries)
+        
+        self.assertEqual(delete_contact(5), delete_contact(50))
+        
+    
+    def test_user_can_import_contacts(self):
+        """
+        Ensure user can import many contacts from JSON, with invalid rows reported.
+        """
+        url = reverse('contact-import-contacts')
+        data = [
+            {'name': 'Imported Contact', 'email': 'imported@mail.com', 'phone': '12345'},
+            {'name': 'Invalid Contact', 'email': 'not-an-email'},
+            {'name': 'other', 'email': 'other@mail.com'},
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertIn('email', response.data['errors'][0]['errors'])
+        
+        imported = Contact.objects.get(email='imported@mail.com')
+        self.assertEqual(imported.initials, 'IC')
+        self.assertIn(imported.badge_color, range(15))
+        self.assertEqual(imported.phone, '12345')
+        self.assertEqual(Contact.objects.get(email='other@mail.com').initials, 'OT')
+        
+    
+    def test_user_can_import_contacts_from_csv(self):
+        """
+        Ensure user can import contacts from a CSV file.
+        """
+        url = reverse('contact-import-contacts')
+        data = 'name,email,phone\nCsv Contact,csv@mail.com,555\nSecond Csv,second.csv@mail.com,\n'
+        response = self.client.post(url, data, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(Contact.objects.get(email='csv@mail.com').initials, 'CC')
+        
+    
+    def test_import_contacts_query_count_is_constant(self):
+        """
+        Ensure importing contacts runs the same number of queries for small and large batches.
+        """
+        url = reverse('contact-import-contacts')
+        self.client.get(reverse('contact-list')) # caches the token, so both imports authenticate alike
+        
+        def import_contacts(count):
+            data = [{'name': f'Contact {i}', 'email': f'contact{i}@mail.com'} for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+        
+        self.assertEqual(import_contacts(5), import_contacts(100))
+        
+    
+    def test_import_contacts_rejects_invalid_input(self):
+        """
+        Ensure the import fails if no row is valid.
+        """
+        url = reverse('contact-import-contacts')
+        response = self.client.post(url, {'name': 'no list'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, [{'name': 'no email'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Contact.objects.count(), 3)
+        
+    
+    def test_user_gets_not_modified_contacts(self):
+        """
+        Ensure the contact list and detail answer with 304 until a contact changes.
+        """
+        list_url = reverse('contact-list')
+        detail_url = reverse('contact-detail', kwargs={'pk': self.contact_no_user.pk})
+        list_etag = self.client.get(list_url, format='json')['ETag']
+        detail_etag = self.client.get(detail_url, format='json')['ETag']
+        self.assertEqual(self.client.get(list_url, format='json', HTTP_IF_NONE_MATCH=list_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.client.get(detail_url, format='json', HTTP_IF_NONE_MATCH=detail_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.client.patch(detail_url, {'name': 'changed contact'}, format='json')
+        self.assertEqual(self.client.get(list_url, format='json', HTTP_IF_NONE_MATCH=list_etag).status_code, status.HTTP_200_OK)
+        response = self.client.get(detail_url, format='json', HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'changed contact')
+        
+    
+    @override_settings(ROOT_URLCONF='join_backend.tests')
+    async def test_user_gets_contacts_async(self):
+        """
+        Ensure the contact list and detail are served by coroutines with ASYNC_VIEWS.
+        """
+        headers = {'Authorization': 'Token ' + self.user_token.key}
+        response = await self.async_client.get(reverse('contact-list'), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 3)
+        
+        response = await self.async_client.get(reverse('contact-detail', kwargs={'pk': self.contact_other_user.pk}), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'contact_other_user')
+        response = await self.async_client.get(reverse('contact-detail', kwargs={'pk': 'invalid'}), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+    
+    def test_fast_read_serializer_output_is_identical(self):
+        """
+        Ensure contact lists serialized from values rows are byte-identical to the ContactSerializer output.
+        """
+        Contact.objects.create(name='Contact Without Details', email='no_details@mail.com')
+        expected = self.client.get(reverse('contact-list'))
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            response = self.client.get(reverse('contact-list'))
+        self.assertEqual(response.content, expected.content)
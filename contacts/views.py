@@ -1,20 +1,58 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated 
-from rest_framework.authentication import TokenAuthentication
-from .serializers import ContactSerializer
+from users.authentication import CachedTokenAuthentication
+from .serializers import ContactSerializer, ContactValuesSerializer
 from .models import Contact
 from .permissions import IsOwnContactOrNoUserContact
+from .parsers import CSVParser
+from join_backend.parsers import FastJSONParser
+from join_backend.mixins import ConditionalGetMixin, AsyncReadMixin, ReplicaReadMixin, ValuesListMixin
 
 # Create your views here.
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin, AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Contact instances.
 
     Provides standard CRUD operations with token authentication.
     Only authenticated users can modify their own contacts or unassigned contacts.
+    Many contacts can be imported at once from JSON or CSV.
+    List and detail responses carry an ETag, detail responses a Last-Modified header as well.
+    Under ASGI, list and retrieve run as coroutines.
     """
 
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
+    values_serializer_class = ContactValuesSerializer
     permission_classes = [IsAuthenticated, IsOwnContactOrNoUserContact]
-    authentication_classes = [TokenAuthentication]
\ No newline at end of file
+    authentication_classes = [CachedTokenAuthentication]
+    import_batch_size = 500
+    
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[FastJSONParser, CSVParser])
+    def import_contacts(self, request):
+        """
+        Create many contacts from a JSON list or a CSV file with a header row.
+
+        Every row is validated on its own. Valid rows are inserted in batches of
+        `import_batch_size`, invalid rows are reported with their index and errors
+        without aborting the import.
+        """
+        if not isinstance(request.data, list):
+            return Response({'detail': 'Expected a list of contacts.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        contacts = []
+        errors = []
+        for index, row in enumerate(request.data):
+            serializer = self.get_serializer(data=row)
+            if serializer.is_valid():
+                contacts.append(Contact(**serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        
+        contacts = Contact.objects.bulk_create(contacts, batch_size=self.import_batch_size)
+        return Response(
+            {'created': [contact.pk for contact in contacts], 'errors': errors},
+            status=status.HTTP_201_CREATED if contacts else status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    A subscriber's queue of events, used as async context manager.
+
+    If the subscriber can't keep up and the queue is full, further events are
+    dropped and `overflowed` is set, so the subscriber can tell its client to
+    reload instead.
+    """
+    
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+        self.loop = None
+    
+    
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.broker.add_subscription(self)
+        return self
+    
+    
+    async def __aexit__(self, *exc_info):
+        self.broker.remove_subscription(self)
+    
+    
+    def put(self, event):
+        """
+        Add an event to the queue. Must be called from the subscriber's event loop.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+    
+    
+    async def get(self):
+        """
+        Wait for the next event.
+        """
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """
+    Broker delivering events to the subscribers within the current process.
+
+    Events only reach the clients connected to the process the change was
+    made in, so the event stream requires the application to run in a single
+    process. With several worker processes, clients miss the changes made in
+    the other processes and have to rely on polling the incremental sync.
+
+    Methods:
+        publish(channel, event): Sends an event to all subscribers of the channel. Can be called from any thread.
+        subscribe(channel): Returns an async context manager entering a Subscription to the channel.
+    """
+    
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self.subscriptions = {}
+        self.lock = threading.Lock()
+    
+    
+    def publish(self, channel, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, event)
+    
+    
+    def subscribe(self, channel):
+        return Subscription(self, channel, self.queue_size)
+    
+    
+    def add_subscription(self, subscription):
+        with self.lock:
+            self.subscriptions.setdefault(subscription.channel, set()).add(subscription)
+    
+    
+    def remove_subscription(self, subscription):
+        with self.lock:
+            self.subscriptions[subscription.channel].discard(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """
+    Return the broker configured with the EVENTS_BROKER setting.
+    """
+    return import_string(settings.EVENTS_BROKER)()
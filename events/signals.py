@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from join_backend.signals import post_bulk_save
+from tasks.models import Task
+from subtasks.models import Subtask
+from contacts.models import Contact
+from .broker import get_broker
+
+BOARD_CHANNEL = 'board'
+
+EVENT_MODELS = {
+    Task: 'task',
+    Subtask: 'subtask',
+    Contact: 'contact',
+}
+
+
+def publish_change(sender, instances, action):
+    """
+    Publish a change event on the board channel once the transaction commits,
+    so clients never see changes that are rolled back.
+    """
+    event = {
+        'model': EVENT_MODELS[sender],
+        'action': action,
+        'ids': [instance.pk for instance in instances],
+    }
+    transaction.on_commit(lambda: get_broker().publish(BOARD_CHANNEL, event))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=Contact)
+def publish_saved_instance(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Task, Subtask or Contact instance is saved.
+    """
+    publish_change(sender, [instance], 'save')
+
+
+@receiver(post_bulk_save, sender=Task)
+@receiver(post_bulk_save, sender=Subtask)
+@receiver(post_bulk_save, sender=Contact)
+def publish_bulk_saved_instances(sender, instances, **kwargs):
+    """
+    Signal handler that is triggered after Task, Subtask or Contact instances are bulk created or updated.
+    """
+    publish_change(sender, instances, 'save')
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=Contact)
+def publish_deleted_instance(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Task, Subtask or Contact instance is deleted.
+    """
+    publish_change(sender, [instance], 'delete')
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from users.models import CustomUser
+from tasks.models import Task
+from contacts.models import Contact
+from .broker import InProcessBroker, get_broker
+
+
+class RecordingBroker(InProcessBroker):
+    """
+    Broker remembering the published events, for tests.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.published = []
+    
+    
+    def publish(self, channel, event):
+        self.published.append((channel, event))
+        super().publish(channel, event)
+
+
+class InProcessBrokerTests(SimpleTestCase):
+    
+    async def test_publish_reaches_subscribers(self):
+        """
+        Ensure published events reach the subscribers of the channel, also from other threads.
+        """
+        broker = InProcessBroker()
+        async with broker.subscribe('board') as subscription, broker.subscribe('other') as other:
+            thread = threading.Thread(target=broker.publish, args=('board', {'model': 'task'}))
+            thread.start()
+            thread.join()
+            self.assertEqual(await asyncio.wait_for(subscription.get(), 1), {'model': 'task'})
+            self.assertTrue(other.queue.empty())
+        self.assertEqual(broker.subscriptions['board'], set())
+        
+    
+    async def test_full_queue_marks_overflow(self):
+        """
+        Ensure events beyond the queue size are dropped and the subscription is marked.
+        """
+        broker = InProcessBroker(queue_size=1)
+        async with broker.subscribe('board') as subscription:
+            broker.publish('board', {'model': 'task'})
+            broker.publish('board', {'model': 'contact'})
+            await asyncio.sleep(0)
+            self.assertTrue(subscription.overflowed)
+            self.assertEqual(await subscription.get(), {'model': 'task'})
+
+
+@override_settings(EVENTS_BROKER='events.tests.RecordingBroker')
+class BoardEventsTests(APITestCase):
+    
+    def setUp(self):
+        get_broker.cache_clear()
+        self.addCleanup(get_broker.cache_clear)
+        self.user = CustomUser.objects.create_user(username='events_user', password='password', email='events_user@mail.com')
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse('board-events')
+        
+    
+    def test_changes_are_published_on_commit(self):
+        """
+        Ensure saved, bulk saved and deleted objects are published once the transaction commits.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title='Task', description='Description', due_date='2030-07-22', category='Technical Task')
+            self.assertEqual(get_broker().published, [])
+        with self.captureOnCommitCallbacks(execute=True):
+            contacts = Contact.objects.bulk_create([Contact(name='First Contact'), Contact(name='Second Contact')])
+        with self.captureOnCommitCallbacks(execute=True):
+            task_id = task.pk
+            task.delete()
+        
+        self.assertEqual(get_broker().published, [
+            ('board', {'model': 'task', 'action': 'save', 'ids': [task_id]}),
+            ('board', {'model': 'contact', 'action': 'save', 'ids': [contact.pk for contact in contacts]}),
+            ('board', {'model': 'task', 'action': 'delete', 'ids': [task_id]}),
+        ])
+        
+    
+    async def test_stream_delivers_events(self):
+        """
+        Ensure the event stream sends the published events to authenticated clients.
+        """
+        response = await self.async_client.get(self.url, {'token': self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+        
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01) # let the stream subscribe
+        get_broker().publish('board', {'model': 'task', 'action': 'save', 'ids': [1]})
+        self.assertEqual(await asyncio.wait_for(next_chunk, 1), b'event: task\ndata: {"model": "task", "action": "save", "ids": [1]}\n\n')
+        await chunks.aclose()
+        
+    
+    async def test_stream_requires_token(self):
+        """
+        Ensure the event stream is only served with a valid token.
+        """
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(self.url, {'token': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(self.url, headers={'Authorization': 'Token ' + self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await response.streaming_content.aclose()
+        
+    
+    def test_stream_requires_asgi(self):
+        """
+        Ensure the event stream isn't served by WSGI workers.
+        """
+        response = self.client.get(self.url, {'token': self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import board_events
+
+urlpatterns = [
+    path('events/', board_events, name='board-events'),
+]
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import exceptions
+from users.authentication import CachedTokenAuthentication
+from .broker import get_broker
+from .signals import BOARD_CHANNEL
+
+
+def format_event(name, data):
+    """
+    Return an event in the Server-Sent Events wire format.
+    """
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+def get_token_key(request):
+    """
+    Return the token key from the Authorization header or, as browsers' EventSource
+    can't set headers, from the `token` query parameter.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0] == 'Token':
+        return header[1]
+    return request.GET.get('token')
+
+
+async def stream_events(channel):
+    """
+    Yield the events of a channel, with comments in between to keep idle connections open.
+    """
+    async with get_broker().subscribe(channel) as subscription:
+        yield f'retry: {settings.EVENTS_RETRY_MILLISECONDS}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event['model'], event)
+            if subscription.overflowed:
+                # events were dropped, the client has to sync
+                yield format_event('resync', {})
+                return
+
+
+async def board_events(request):
+    """
+    Stream the change events of the board as Server-Sent Events.
+
+    Each event names the changed model and carries the action and the ids,
+    e.g. `event: task` with `{"model": "task", "action": "save", "ids": [1, 2]}`.
+    Clients fetch the changes with the sync endpoint. A `resync` event tells
+    the client that it fell behind and events were dropped.
+
+    The stream needs the ASGI server, a WSGI worker would be blocked by it.
+    """
+    if request.method != 'GET':
+        return HttpResponse(status=405, headers={'Allow': 'GET'})
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse('The event stream is only served by the ASGI application.', status=501)
+    
+    key = get_token_key(request)
+    if not key:
+        return HttpResponse(status=401)
+    try:
+        await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+    except exceptions.AuthenticationFailed:
+        return HttpResponse(status=401)
+    
+    response = StreamingHttpResponse(stream_events(BOARD_CHANNEL), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # disable proxy buffering
+    return response
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class JoinBackendConfig(AppConfig):
+    name = 'join_backend'
+
+    def ready(self) -> None:
+        import join_backend.db
+        import join_backend.metrics
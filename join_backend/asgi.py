@@ -2,6 +2,8 @@
 ASGI config for join_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the API, it serves the event stream of ``events.views.board_events``.
+The async views are enabled with ``DJANGO_ASYNC_VIEWS``, see the ASYNC_VIEWS setting.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -12,5 +14,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'join_backend.settings')
+os.environ.setdefault('DJANGO_ASYNC_VIEWS', 'true')
 
 application = get_asgi_application()
@@ -0,0 +1,41 @@
+from django.db import models
+from django.utils import timezone
+from .signals import post_bulk_save
+
+
+class BulkSignalQuerySet(models.QuerySet):
+    """
+    QuerySet that sends `post_bulk_save` after bulk_create and bulk_update.
+
+    Bulk writes skip save() and the post_save signal, so receivers that keep
+    caches or change logs in sync listen to `post_bulk_save` as well.
+    bulk_update also sets `auto_now` fields like save() does.
+    """
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Insert the objects and send `post_bulk_save` with created=True.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            post_bulk_save.send(sender=self.model, instances=objs, created=True)
+        return objs
+    
+    
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """
+        Update the given fields of the objects and send `post_bulk_save` with created=False.
+        Fields with `auto_now` are set to the current time and updated as well.
+        """
+        objs = list(objs)
+        fields = set(fields)
+        now = timezone.now()
+        for field in self.model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for obj in objs:
+                    setattr(obj, field.attname, now)
+                fields.add(field.name)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if objs:
+            post_bulk_save.send(sender=self.model, instances=objs, created=False)
+        return rows
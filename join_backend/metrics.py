@@ -0,0 +1,169 @@
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# The record of the request being handled, if any.
+current_record = ContextVar('request_metrics_record', default=None)
+
+
+class RequestRecord:
+    """
+    Measurements of a single request, filled while the request is handled.
+
+    Times are in seconds. The SQL time and the serializer time overlap where
+    a serializer evaluates a queryset.
+
+    Attributes:
+        name (str): The view and action, e.g. `TaskViewSet.list`.
+        start (float): perf_counter() when the request came in.
+        queries (int): Number of executed queries, executemany counts once.
+        sql_time (float): Time spent executing queries.
+        serializer_time (float): Time spent in serializers' to_representation.
+    """
+    __slots__ = ('name', 'start', 'queries', 'sql_time', 'serializer_time', 'serializing')
+
+    def __init__(self):
+        self.name = None
+        self.start = perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding the query and its time to the current record.
+    """
+    record = current_record.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.sql_time += perf_counter() - start
+        record.queries += 1
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Signal handler that is triggered after a database connection is opened.
+    Adds record_query to the execute wrappers of the connection, so queries of
+    every thread and database are recorded without wrapping them per request.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def timed_serialization(func, *args):
+    """
+    Call `func` and add its time to the serializer time of the current record.
+
+    Calls within a timed call, e.g. of nested serializers or the child of a
+    list serializer, are not counted again.
+    """
+    record = current_record.get()
+    if record is None or record.serializing:
+        return func(*args)
+    record.serializing = True
+    start = perf_counter()
+    try:
+        return func(*args)
+    finally:
+        record.serializer_time += perf_counter() - start
+        record.serializing = False
+
+
+class RequestMetrics:
+    """
+    In-process store aggregating the request records per view and action.
+
+    Every name keeps a few counters and sums, so recording a request takes
+    constant time and memory doesn't grow with the number of requests. Each
+    process of a deployment has its own store.
+
+    Methods:
+        add(record, status_code, duration, response_size): Adds a finished request.
+        snapshot(): Returns the aggregates with averages, by name.
+        reset(): Removes all aggregates.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.aggregates = {}
+
+
+    def add(self, record, status_code, duration, response_size):
+        """
+        Add a finished request. `response_size` is None for streaming responses.
+        """
+        with self.lock:
+            aggregate = self.aggregates.get(record.name)
+            if aggregate is None:
+                aggregate = self.aggregates[record.name] = {
+                    'count': 0, 'errors': 0, 'time': 0.0, 'max_time': 0.0, 'queries': 0, 'max_queries': 0,
+                    'sql_time': 0.0, 'serializer_time': 0.0, 'sized': 0, 'response_bytes': 0,
+                }
+            aggregate['count'] += 1
+            aggregate['errors'] += status_code >= 500
+            aggregate['time'] += duration
+            aggregate['max_time'] = max(aggregate['max_time'], duration)
+            aggregate['queries'] += record.queries
+            aggregate['max_queries'] = max(aggregate['max_queries'], record.queries)
+            aggregate['sql_time'] += record.sql_time
+            aggregate['serializer_time'] += record.serializer_time
+            if response_size is not None:
+                aggregate['sized'] += 1
+                aggregate['response_bytes'] += response_size
+
+
+    def snapshot(self):
+        """
+        Return the aggregates by name, with times in ms and averages per request.
+        """
+        with self.lock:
+            aggregates = {name: dict(aggregate) for name, aggregate in self.aggregates.items()}
+        snapshot = {}
+        for name, aggregate in sorted(aggregates.items()):
+            count = aggregate['count']
+            snapshot[name] = {
+                'count': count,
+                'errors': aggregate['errors'],
+                'mean_ms': round(aggregate['time'] / count * 1000, 3),
+                'max_ms': round(aggregate['max_time'] * 1000, 3),
+                'mean_queries': round(aggregate['queries'] / count, 2),
+                'max_queries': aggregate['max_queries'],
+                'mean_sql_ms': round(aggregate['sql_time'] / count * 1000, 3),
+                'mean_serializer_ms': round(aggregate['serializer_time'] / count * 1000, 3),
+                'mean_response_bytes': round(aggregate['response_bytes'] / aggregate['sized']) if aggregate['sized'] else None,
+            }
+        return snapshot
+
+
+    def reset(self):
+        with self.lock:
+            self.aggregates = {}
+
+
+request_metrics = RequestMetrics()
+
+
+def view_name(view_func, method):
+    """
+    Return the name requests to the view are recorded under: the view class
+    and the action for DRF views, e.g. `TaskViewSet.list` or `LoginView.post`,
+    and the qualified name for other views.
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__qualname__', type(view_func).__qualname__)
+    method = method.lower()
+    actions = getattr(view_func, 'actions', None)
+    if actions is not None:
+        # like ViewSetMixin, HEAD is answered by the action of GET
+        method = actions.get(method) or (actions.get('get') if method == 'head' else None) or method
+    return f'{cls.__name__}.{method}'
@@ -0,0 +1,111 @@
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from .metrics import RequestRecord, current_record, request_metrics, view_name
+from .routers import pin_to_primary
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Middleware pinning a user's reads to the primary database after a write.
+
+    Every request with an unsafe method by an authenticated user counts as
+    write. DRF sets the user it authenticated on the Django request, so the
+    user is known once the response is returned.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.process_response(request)
+        return response
+    
+    
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.process_response(request)
+        return response
+    
+    
+    def process_response(self, request):
+        user = getattr(request, 'user', None)
+        if request.method not in SAFE_METHODS and user is not None and user.is_authenticated:
+            pin_to_primary(user)
+
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware measuring every request and adding it to `request_metrics`.
+
+    A request is recorded with its total time, the number and time of its
+    queries on all databases, the time spent in serializers and the size of
+    the response, under the name of its view and action, e.g.
+    `TaskViewSet.list`. With the SERVER_TIMING setting, the measurements are
+    also sent in the Server-Timing header, which browsers show in their
+    developer tools. As every client can read it, it is meant for development.
+
+    Placed first in MIDDLEWARE, the total time includes the other middleware.
+    For streaming responses, the total time ends when streaming starts and
+    the size is unknown.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+    
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        record = RequestRecord()
+        token = current_record.set(record)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_record.reset(token)
+        return self.process_response(request, response, record)
+    
+    
+    async def __acall__(self, request):
+        record = RequestRecord()
+        token = current_record.set(record)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_record.reset(token)
+        return self.process_response(request, response, record)
+    
+    
+    def process_response(self, request, response, record):
+        duration = perf_counter() - record.start
+        match = getattr(request, 'resolver_match', None)
+        record.name = view_name(match.func, request.method) if match is not None else 'unresolved'
+        request_metrics.add(record, response.status_code, duration, None if response.streaming else len(response.content))
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = server_timing(record, duration)
+        return response
+
+
+def server_timing(record, duration):
+    """
+    Return the value of the Server-Timing header of a request, durations in ms.
+    """
+    return (
+        f'total;dur={duration * 1000:.3f}, '
+        f'db;dur={record.sql_time * 1000:.3f};desc="{record.queries} queries", '
+        f'serializer;dur={record.serializer_time * 1000:.3f}'
+    )
@@ -0,0 +1,316 @@
+import hashlib
+from functools import update_wrapper
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from .metrics import timed_serialization
+from .routers import read_replica, choose_replica, is_pinned_to_primary
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding weak ETags to list and retrieve and a Last-Modified
+    header to retrieve.
+
+    The validators are computed with a single aggregate query over the filtered
+    queryset (row count and latest `updated_at`), so a request with a matching
+    If-None-Match or If-Modified-Since header is answered with 304 Not Modified
+    without loading or serializing any object.
+
+    Lists have no Last-Modified header: deleting any but the newest row leaves
+    the latest `updated_at` of the list unchanged, so only the row count in
+    the ETag notices the deletion.
+
+    Methods:
+        get_validator_aggregates(queryset): Returns the values the validators are derived from.
+    """
+    
+    def get_validator_aggregates(self, queryset):
+        """
+        Aggregate the values that change whenever the response would change.
+        Datetime values are also used for the Last-Modified header.
+        """
+        return queryset.aggregate(count=Count('pk'), updated_at=Max('updated_at'))
+    
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(request, queryset, super().list, *args, **kwargs)
+    
+    
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_lookup_queryset()
+        if queryset is None:
+            return super().retrieve(request, *args, **kwargs) # invalid lookups are handled like before
+        return self.conditional_response(request, queryset, super().retrieve, *args, **kwargs)
+    
+    
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return await self.aconditional_response(request, queryset, super().alist, *args, **kwargs)
+    
+    
+    async def aretrieve(self, request, *args, **kwargs):
+        queryset = self.get_lookup_queryset()
+        if queryset is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        return await self.aconditional_response(request, queryset, super().aretrieve, *args, **kwargs)
+    
+    
+    def get_lookup_queryset(self):
+        """
+        Return the filtered queryset narrowed down to the requested object, or None if the lookup value is invalid.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return None
+    
+    
+    def get_validators(self, request, aggregates):
+        """
+        Return the ETag and the Last-Modified timestamp derived from the aggregates.
+        The timestamp is None for lists.
+        """
+        timestamps = [value.timestamp() for value in aggregates.values() if hasattr(value, 'timestamp')]
+        last_modified = int(max(timestamps)) if timestamps and self.action != 'list' else None
+        
+        version = f'{request.get_full_path()}|{request.accepted_media_type}|{sorted(aggregates.items())}'
+        etag = f'W/"{hashlib.md5(version.encode()).hexdigest()}"'
+        return etag, last_modified
+    
+    
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+    
+    
+    def conditional_response(self, request, queryset, handler, *args, **kwargs):
+        """
+        Return 304 Not Modified if the client's copy is current, otherwise the
+        response of `handler` with ETag and Last-Modified headers.
+        """
+        etag, last_modified = self.get_validators(request, self.get_validator_aggregates(queryset))
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+    
+    
+    async def aconditional_response(self, request, queryset, handler, *args, **kwargs):
+        """
+        Async variant of `conditional_response` for a coroutine `handler`.
+        """
+        aggregates = await sync_to_async(self.get_validator_aggregates)(queryset)
+        etag, last_modified = self.get_validators(request, aggregates)
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+
+class AsyncDispatchMixin:
+    """
+    APIView mixin serving some requests with coroutines, used by AsyncReadMixin
+    and AsyncPostMixin.
+
+    The view becomes an async view: a request is dispatched to the coroutine
+    method named by `get_async_handler`, every other request is passed on to
+    the synchronous view. Authentication, permissions, throttling and
+    exception handling are the ones of the synchronous view.
+
+    Methods:
+        async_view(view, actions, initkwargs): Returns the async view wrapping the synchronous view.
+        get_async_handler(method, actions): Defined by subclasses, returns the name of the coroutine serving the method, or None.
+        adispatch(handler, request): Async counterpart of `dispatch`.
+    """
+    
+    @classmethod
+    def async_view(cls, view, actions, initkwargs):
+        sync_view = sync_to_async(view)
+        
+        async def async_view(request, *args, **kwargs):
+            handler = cls.get_async_handler(request.method.lower(), actions)
+            if handler is None:
+                return await sync_view(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            if actions is not None:
+                self.action_map = actions
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(handler, request, *args, **kwargs)
+        
+        # keep the attributes of the DRF view, e.g. cls, actions and csrf_exempt
+        update_wrapper(async_view, view)
+        del async_view.__wrapped__
+        return async_view
+    
+    
+    async def adispatch(self, handler, request, *args, **kwargs):
+        """
+        Async counterpart of `dispatch`, calling the coroutine method `handler`.
+        """
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            # authentication may query the database
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await getattr(self, handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncReadMixin(AsyncDispatchMixin):
+    """
+    ViewSet mixin serving list and retrieve as coroutines using Django's async ORM.
+
+    Under ASGI, synchronous views share a single thread, so one request waiting
+    for a locked SQLite database holds up all others. With this mixin, the
+    routes of list and retrieve are async views: a GET request awaits its
+    queries on the event loop, while every other method of the same route is
+    passed on to the synchronous viewset. Under WSGI, Django would run the
+    async views in an event loop per request, so the routes only become async
+    views with the ASYNC_VIEWS setting, which asgi.py enables.
+
+    Authentication, permissions, filtering, pagination and serialization are
+    the ones of the synchronous viewset. Serializers must not query the
+    database, i.e. related objects have to be prefetched.
+
+    Methods:
+        alist(request): Async counterpart of `list`.
+        aretrieve(request): Async counterpart of `retrieve`.
+        aget_object(): Async counterpart of `get_object`.
+    """
+    async_actions = {'list': 'alist', 'retrieve': 'aretrieve'}
+    
+    
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_VIEWS or not any(action in cls.async_actions for action in actions.values()):
+            return view # e.g. extra actions
+        return cls.async_view(view, actions, initkwargs)
+    
+    
+    @classmethod
+    def get_async_handler(cls, method, actions):
+        return cls.async_actions.get(actions.get('get' if method == 'head' else method))
+    
+    
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await sync_to_async(self.paginate_queryset)(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+    
+    
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
+    
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+
+class AsyncPostMixin(AsyncDispatchMixin):
+    """
+    APIView mixin serving POST requests with the coroutine `apost`.
+
+    Like AsyncReadMixin, the view becomes an async view: POST requests are
+    dispatched to `apost` on the event loop, every other method is passed on
+    to the synchronous view. Unlike AsyncReadMixin, this also applies under
+    WSGI, where the overhead of the event loop is small compared to the work
+    `apost` hands off, e.g. password hashing.
+
+    Methods:
+        apost(request): Async counterpart of `post`.
+    """
+    
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return cls.async_view(super().as_view(**initkwargs), None, initkwargs)
+    
+    
+    @classmethod
+    def get_async_handler(cls, method, actions):
+        return 'apost' if method == 'post' else None
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin sending the reads of GET and HEAD requests to a replica.
+
+    One replica is chosen per request. Users who wrote within the last
+    REPLICA_STICKINESS_SECONDS read from the primary instead, see
+    ReplicaStickinessMiddleware.
+    """
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request.user):
+            read_replica.set(choose_replica())
+    
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        read_replica.set(None)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    ViewSet mixin serializing list responses with a ValuesSerializer if the
+    FAST_READ_SERIALIZERS setting is enabled.
+
+    Filtering and pagination work on the values query, the response equals
+    the one of `serializer_class`.
+
+    Attributes:
+        values_serializer_class: The ValuesSerializer of the list response.
+    """
+    values_serializer_class = None
+    
+    
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_READ_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+        return self.values_list_response()
+    
+    
+    async def alist(self, request, *args, **kwargs):
+        if not settings.FAST_READ_SERIALIZERS:
+            return await super().alist(request, *args, **kwargs)
+        return await sync_to_async(self.values_list_response)()
+    
+    
+    def values_list_response(self):
+        serializer = self.values_serializer_class()
+        rows = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(timed_serialization(serializer.to_representation, page))
+        return Response(timed_serialization(serializer.to_representation, rows))
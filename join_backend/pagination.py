@@ -0,0 +1,18 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination for all list endpoints.
+
+    Pages are selected with a `WHERE id > ...` condition on the primary key
+    instead of an offset, so fetching a page costs the same no matter how far
+    into the table it is, and rows inserted or deleted meanwhile don't shift
+    the following pages.
+
+    The page size defaults to the `PAGE_SIZE` setting and can be changed per
+    request with the `page_size` query parameter, up to `max_page_size`.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
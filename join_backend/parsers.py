@@ -0,0 +1,41 @@
+import codecs
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses integers beyond 64 bit as floats, bodies with runs of 19 or
+# more digits are left to the stdlib. Mapping digits to b'0' and all other
+# bytes to b' ' finds them several times faster than a regular expression.
+DIGITS = bytes(b'0'[0] if byte in b'0123456789' else b' '[0] for byte in range(256))
+LONG_NUMBER = b'0' * 19
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 request bodies with orjson if it is installed.
+
+    Bodies orjson rejects are parsed again by DRF's JSONParser, which accepts
+    a few inputs orjson doesn't, e.g. escaped lone surrogates, and raises its
+    usual errors otherwise. Without orjson, for other encodings or if the
+    STRICT_JSON setting is disabled, DRF's JSONParser is used.
+    """
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not api_settings.STRICT_JSON or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        
+        content = stream.read()
+        if LONG_NUMBER not in content.translate(DIGITS):
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,43 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson if it is installed.
+
+    The output equals the one of DRF's JSONRenderer: dates, times, decimals,
+    lazy strings and every other type orjson doesn't encode natively are
+    passed to DRF's JSONEncoder, and U+2028 and U+2029 are escaped.
+
+    DRF's renderer is used instead without orjson, for indented output, if
+    the COMPACT_JSON, UNICODE_JSON or STRICT_JSON settings differ from their
+    defaults and for data orjson can't encode, e.g. integers beyond 64 bit.
+
+    Differences are limited to floats, which the API doesn't return: orjson
+    writes exponents like `1e16` instead of `1e+16` and NaN and Infinity as
+    null instead of failing.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # escape the line and paragraph separators like JSONRenderer, they are invalid in JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,65 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# The replica alias reads of the current request are sent to, if any.
+read_replica = ContextVar('read_replica', default=None)
+
+
+def choose_replica():
+    """
+    Return a random alias of the DATABASE_REPLICAS setting, or None without replicas.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+def primary_pin_key(user):
+    return f'db:primary:{user.pk}'
+
+
+def pin_to_primary(user):
+    """
+    Send the reads of the user to the primary for REPLICA_STICKINESS_SECONDS,
+    so the user reads their own writes while the replicas catch up.
+    """
+    cache.set(primary_pin_key(user), True, settings.REPLICA_STICKINESS_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(primary_pin_key(user), False)
+
+
+class ReadWriteRouter:
+    """
+    Database router sending reads to a replica and writes to the primary.
+
+    Reads only go to a replica while `read_replica` is set, i.e. in the views
+    using ReplicaReadMixin, so one request reads from a single replica. Any
+    other read, and any read inside a transaction on the primary, uses the
+    primary, so it sees the latest and the transaction's own writes.
+
+    With SQLite, the replica `read` is a second connection to the same file,
+    so reads don't queue behind the single writer. Real replicas, e.g. of
+    Postgres or copies of the SQLite file, are listed in DATABASE_REPLICAS.
+    """
+    
+    def db_for_read(self, model, **hints):
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return read_replica.get()
+    
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replicas hold copies of the primary
+        return True
+    
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
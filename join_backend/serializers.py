@@ -0,0 +1,51 @@
+from .metrics import timed_serialization
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin adding the time of to_representation to the serializer
+    time of the current request, see RequestMetricsMiddleware.
+
+    Nested serializers and the child of a list serializer are timed as part
+    of the outermost serializer.
+    """
+    
+    def to_representation(self, instance):
+        return timed_serialization(super().to_representation, instance)
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer building representations directly from `.values()` rows.
+
+    A ModelSerializer instantiates its fields by introspecting the model and
+    calls a field's to_representation for every attribute of every object.
+    For plain columns, a `.values()` row already holds the representation, so
+    a ValuesSerializer only copies the row and converts the few values whose
+    JSON representation differs, e.g. dates. Related objects are fetched with
+    one query per relation and grouped in Python.
+
+    The output has to equal the one of the corresponding ModelSerializer, key
+    order included, so responses stay byte-identical.
+
+    Attributes:
+        fields (list): The columns, in the order of the output. A foreign key
+            is represented by the id of the related object.
+
+    Methods:
+        get_rows(queryset): Returns the values query of the queryset.
+        to_representation(rows): Returns the representations of the rows.
+    """
+    fields = []
+    
+    
+    def get_rows(self, queryset):
+        """
+        Return the values query of the queryset. Prefetching doesn't apply to
+        values queries, related data is added by to_representation.
+        """
+        return queryset.prefetch_related(None).values(*self.fields)
+    
+    
+    def to_representation(self, rows):
+        return [dict(row) for row in rows]
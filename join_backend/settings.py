@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,14 +40,18 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework.authtoken',
+    'join_backend',
     'tasks',
     'subtasks',
     'users',
     'contacts',
+    'sync',
+    'events',
     'corsheaders',
 ]
 
 MIDDLEWARE = [
+    'join_backend.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -55,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'join_backend.middleware.ReplicaStickinessMiddleware',
 ]
 
 ROOT_URLCONF = 'join_backend.urls'
@@ -82,14 +88,103 @@ WSGI_APPLICATION = 'join_backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# 'read' is a second connection to the same file. ReadWriteRouter sends the
+# reads of the task, contact and user endpoints there, so they don't queue
+# behind the single SQLite writer. Connections are kept open for CONN_MAX_AGE
+# seconds instead of being reopened per request.
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    'read': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['join_backend.routers.ReadWriteRouter']
+
+# Aliases of the read replicas, e.g. of a Postgres primary. After a write,
+# a user reads from the primary for REPLICA_STICKINESS_SECONDS, so replication
+# lag doesn't hide the user's own changes.
+
+DATABASE_REPLICAS = ['read']
+REPLICA_STICKINESS_SECONDS = 10
+
+# Applied to every new SQLite connection by join_backend.db.
+# WAL lets readers work while a write is in progress, busy_timeout (ms) makes
+# a writer wait for the lock instead of failing with "database is locked",
+# cache_size is negative for KiB and mmap_size is in bytes.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 134217728,
+    'temp_store': 'memory',
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# 'tokens' backs users.authentication.CachedTokenAuthentication. LocMemCache
+# evicts the least recently used entries beyond MAX_ENTRIES. Use a shared
+# backend like Redis when running several worker processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tokens',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+
+# Serve the task and contact list and retrieve as async views (see
+# join_backend.mixins.AsyncReadMixin). Only worthwhile under ASGI, under WSGI
+# every async view costs an event loop per request. asgi.py enables it with
+# the DJANGO_ASYNC_VIEWS environment variable before the URLconf is loaded.
+
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS', 'false').lower() == 'true'
+
+
+# Incremental sync
+# A sync response covers at most SYNC_MAX_CHANGES entries of the change log.
+# Transactions writing changes have to finish within SYNC_SETTLE_SECONDS,
+# see sync.views.SyncView. prune_changes deletes the entries older than
+# SYNC_RETENTION_DAYS, clients that were offline longer reload the board.
+
+SYNC_MAX_CHANGES = 1000
+SYNC_SETTLE_SECONDS = 10
+SYNC_RETENTION_DAYS = 30
+
+
+# Real-time events
+# events.views.board_events pushes change events from the broker to connected
+# clients. The in-process broker only reaches clients of the same process, so
+# the event stream requires running a single worker process.
+
+EVENTS_BROKER = 'events.broker.InProcessBroker'
+EVENTS_KEEPALIVE_SECONDS = 15
+EVENTS_RETRY_MILLISECONDS = 3000
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -108,6 +203,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# New passwords are hashed with scrypt, which is memory-hard and several times
+# cheaper in CPU than PBKDF2 at Django's defaults. PBKDF2 hashes of existing
+# users still verify and are replaced with scrypt hashes on the next login.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+# Login and registration hash in a pool of PASSWORD_HASHING_WORKERS threads
+# (see users.hashing). Each scrypt hash needs 16 MiB of memory. When more than
+# PASSWORD_HASHING_MAX_PENDING hashes are queued or running, further logins
+# are answered with 503 and a Retry-After header.
+
+PASSWORD_HASHING_WORKERS = 4
+PASSWORD_HASHING_MAX_PENDING = 64
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -142,9 +257,36 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'join_backend.pagination.IdCursorPagination',
+    'PAGE_SIZE': 100,
+    # orjson based, with DRF's stdlib implementation as fallback
+    'DEFAULT_RENDERER_CLASSES': [
+        'join_backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'join_backend.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Serialize the task, subtask, contact and user lists from values queries
+# (see join_backend.serializers.ValuesSerializer) instead of the model
+# serializers. The responses are the same, but the model serializers are
+# bypassed, including the task representation cache.
+
+FAST_READ_SERIALIZERS = False
+
+# join_backend.middleware.RequestMetricsMiddleware records the time, queries,
+# serializer time and response size of every request per view and action,
+# see /api/metrics/ (staff only). With SERVER_TIMING, every response carries
+# its measurements in the Server-Timing header, which any client can read, so
+# it is only sent in development.
+
+SERVER_TIMING = DEBUG
+
 CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:5500',
     'http://127.0.0.1:5501',
@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+# Sent after model instances were written with bulk_create or bulk_update,
+# which don't send post_save.
+#
+# Arguments:
+#     sender: The model class.
+#     instances: The list of created or updated instances.
+#     created: True for bulk_create, False for bulk_update.
+post_bulk_save = Signal()
@@ -0,0 +1,251 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from rest_framework.routers import DefaultRouter
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from rest_framework.test import APITestCase, APITransactionTestCase
+from users.models import CustomUser
+from tasks.models import Task
+from tasks.views import TaskViewSet
+from contacts.views import ContactViewSet
+from .metrics import request_metrics
+from .routers import read_replica
+from .renderers import FastJSONRenderer
+from .parsers import FastJSONParser
+
+# URLconf of the task and contact routes with the async views of ASYNC_VIEWS,
+# as served by asgi.py. Tests of the async views use it as ROOT_URLCONF.
+with override_settings(ASYNC_VIEWS=True):
+    async_router = DefaultRouter()
+    async_router.register(r'tasks', TaskViewSet, basename='task')
+    async_router.register(r'contacts', ContactViewSet, basename='contact')
+    urlpatterns = [path('api/', include(async_router.urls))]
+
+
+class SQLitePragmaTests(TestCase):
+    
+    def test_pragmas_are_applied(self):
+        """
+        Ensure new SQLite connections are configured with the SQLITE_PRAGMAS setting.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1) # normal
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -20000)
+
+
+class ReadWriteRouterTests(APITransactionTestCase):
+    databases = {'default', 'read'}
+    
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='router_user', password='password', email='router_user@mail.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.task = Task.objects.create(title='Task', description='Description', due_date='2030-07-22', category='Technical Task')
+        
+    
+    def test_reads_use_replica_only_when_chosen(self):
+        """
+        Ensure reads go to the primary unless a replica is chosen, and writes always go to the primary.
+        """
+        self.assertEqual(self.task._state.db, 'default')
+        self.assertEqual(Task.objects.all().db, 'default')
+        
+        read_replica.set('read')
+        try:
+            with CaptureQueriesContext(connections['read']) as queries:
+                self.assertEqual(Task.objects.get().title, 'Task')
+            self.assertEqual(len(queries), 1)
+            Task.objects.filter(pk=self.task.pk).update(status='done')
+            with transaction.atomic():
+                self.assertEqual(Task.objects.all().db, 'default') # sees uncommitted writes
+        finally:
+            read_replica.set(None)
+        
+    
+    def test_viewset_reads_use_replica(self):
+        """
+        Ensure the task list is read from a replica, also by the async path, and the view resets the choice.
+        """
+        with CaptureQueriesContext(connections['read']) as queries:
+            response = self.client.get(reverse('task-list'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(queries), 0)
+        self.assertIsNone(read_replica.get())
+        
+        with override_settings(ROOT_URLCONF='join_backend.tests'), CaptureQueriesContext(connections['read']) as queries:
+            response = async_to_sync(self.async_client.get)(reverse('task-detail', args=[self.task.pk]), headers={'Authorization': 'Token ' + self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(queries), 0)
+        self.assertIsNone(read_replica.get())
+        
+    
+    def test_reads_stick_to_primary_after_write(self):
+        """
+        Ensure a user reads from the primary for a while after writing, while other users still use replicas.
+        """
+        response = self.client.patch(reverse('task-detail', args=[self.task.pk]), {'status': 'done'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connections['read']) as queries:
+            response = self.client.get(reverse('task-list'), format='json')
+        self.assertEqual(response.data['results'][0]['status'], 'done')
+        self.assertEqual(len(queries), 0)
+        
+        other_user = CustomUser.objects.create_user(username='router_other_user', password='password', email='router_other_user@mail.com')
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=other_user).key)
+        with CaptureQueriesContext(connections['read']) as queries:
+            self.client.get(reverse('task-list'), format='json')
+        self.assertGreater(len(queries), 0)
+
+
+class FastJSONTests(SimpleTestCase):
+    
+    data = {
+        'id': 1,
+        'title': 'Ünïcode ✓ and "quotes" \\ and line\u2028separators\u2029',
+        'done': False,
+        'missing': None,
+        'ratio': 0.25,
+        'price': Decimal('12.50'),
+        'lazy': gettext_lazy('Lazy string'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'due_date': datetime.date(2030, 7, 22),
+        'time': datetime.time(12, 30, 15, 123456),
+        'naive': datetime.datetime(2030, 7, 22, 12, 30, 15, 123456),
+        'aware': datetime.datetime(2030, 7, 22, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'offset': datetime.datetime(2030, 7, 22, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        'duration': datetime.timedelta(hours=1, seconds=1),
+        'status': {'to-do': 1, 'done': 0},
+        1: 'integer key',
+        'nested': [ReturnDict({'a': [1, 2, {'b': ()}]}, serializer=None), ReturnList([], serializer=None)],
+    }
+    
+    def test_renderer_output_equals_json_renderer(self):
+        """
+        Ensure the fast renderer produces the same bytes as DRF's JSONRenderer, also without orjson and with indentation.
+        """
+        with patch.object(JSONRenderer, 'render', side_effect=AssertionError('orjson is not used')):
+            rendered = [FastJSONRenderer().render(data) for data in (self.data, [self.data], {}, [], 'string', 1)]
+        self.assertEqual(rendered, [JSONRenderer().render(data) for data in (self.data, [self.data], {}, [], 'string', 1)])
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        self.assertEqual(FastJSONRenderer().render({'big': 2 ** 70}), JSONRenderer().render({'big': 2 ** 70}))
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, renderer_context={'indent': 4}),
+            JSONRenderer().render(self.data, renderer_context={'indent': 4}),
+        )
+        with patch('join_backend.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'unknown': object()})
+        
+    
+    def test_parser_output_equals_json_parser(self):
+        """
+        Ensure the fast parser returns the same data as DRF's JSONParser and rejects the same input.
+        """
+        bodies = [
+            b'{"title": "\xc3\x9cn\xc3\xafcode \\u2713", "subtasks": [{"is_done": true}], "assigned_to": [1, 2], "priority": null}',
+            b'[1.5, -2, 1e3, "\\ud83d\\ude00"]',
+            b'{"big": 123456789012345678901234567890}',
+            b'{"lone surrogate": "\\ud800"}',
+        ]
+        for body in bodies:
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        for body in (b'{"invalid": }', b'{"nan": NaN}', b''):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+
+
+class RequestMetricsTests(APITestCase):
+    
+    def setUp(self):
+        cache.clear()
+        request_metrics.reset()
+        self.user = CustomUser.objects.create_user(username='metrics_user', password='password', email='metrics_user@mail.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        Task.objects.create(title='Task', description='Description', due_date='2030-07-22', category='Technical Task')
+        
+    
+    @override_settings(SERVER_TIMING=True)
+    def test_requests_are_recorded_by_view_and_action(self):
+        """
+        Ensure requests are recorded under their viewset and action with queries, serializer time and size.
+        """
+        response = self.client.get(reverse('task-list'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries", serializer;dur=[\d.]+$')
+        self.client.post(reverse('task-list'), {'title': 'New'}, format='json')
+        async_to_sync(self.async_client.get)(reverse('task-list'), headers={'Authorization': 'Token ' + self.token.key})
+        
+        metrics = request_metrics.snapshot()
+        self.assertEqual(metrics['TaskViewSet.list']['count'], 2)
+        self.assertEqual(metrics['TaskViewSet.create']['count'], 1)
+        task_list = metrics['TaskViewSet.list']
+        self.assertGreater(task_list['mean_queries'], 0)
+        self.assertGreater(task_list['mean_sql_ms'], 0)
+        self.assertGreater(task_list['mean_serializer_ms'], 0)
+        self.assertEqual(task_list['mean_response_bytes'], len(response.content))
+        self.assertEqual(task_list['errors'], 0)
+        
+    
+    @override_settings(SERVER_TIMING=True)
+    def test_cached_task_list_reports_serializer_time(self):
+        """
+        Ensure a task list answered from the representation cache still reports its serializer time.
+        """
+        self.client.get(reverse('task-list'), format='json')
+        response = self.client.get(reverse('task-list'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        serializer_time = float(response['Server-Timing'].rsplit('serializer;dur=', 1)[1])
+        self.assertGreater(serializer_time, 0)
+        
+    
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_header_is_optional(self):
+        """
+        Ensure the Server-Timing header is omitted without SERVER_TIMING, while requests are still recorded.
+        """
+        response = self.client.get(reverse('task-list'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(request_metrics.snapshot()['TaskViewSet.list']['count'], 1)
+        
+    
+    def test_metrics_endpoint_is_staff_only(self):
+        """
+        Ensure only staff users can read and reset the metrics.
+        """
+        self.client.get(reverse('task-summary'), format='json')
+        response = self.client.get(reverse('request-metrics'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.user.is_staff = True
+        self.user.save()
+        cache.clear()
+        response = self.client.get(reverse('request-metrics'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['TaskViewSet.summary']['count'], 1)
+        self.assertEqual(response.data['RequestMetricsView.get']['count'], 1)
+        response = self.client.delete(reverse('request-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(request_metrics.snapshot()), ['RequestMetricsView.delete'])
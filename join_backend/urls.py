@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework import routers
+from .views import RequestMetricsView
 
 router = routers.DefaultRouter()
 
@@ -28,4 +29,7 @@ urlpatterns += [
     path('api/', include('users.urls')),
     path('api/', include('contacts.urls')),
     path('api/', include('subtasks.urls')),
+    path('api/', include('sync.urls')),
+    path('api/', include('events.urls')),
+    path('api/metrics/', RequestMetricsView.as_view(), name='request-metrics'),
 ]
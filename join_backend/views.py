@@ -0,0 +1,29 @@
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from users.authentication import CachedTokenAuthentication
+from .metrics import request_metrics
+
+
+class RequestMetricsView(APIView):
+    """
+    View returning the request metrics of this process by view and action,
+    see RequestMetricsMiddleware. Staff only.
+
+    GET returns the count, errors, mean and max time, queries, SQL and
+    serializer time and response size per name. DELETE resets the metrics,
+    e.g. before a load test.
+    """
+    permission_classes = [IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication, SessionAuthentication]
+    
+    
+    def get(self, request):
+        return Response(request_metrics.snapshot())
+    
+    
+    def delete(self, request):
+        request_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
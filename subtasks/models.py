@@ -1,4 +1,5 @@
 from django.db import models
+from join_backend.managers import BulkSignalQuerySet
 from tasks.models import Task
 
 # Create your models here.
@@ -10,8 +11,12 @@ class Subtask(models.Model):
         is_done (bool): Indicates whether the subtask is completed. Defaults to False.
         description (str): A brief description of the subtask, with a maximum length of 200 characters.
         task (Task): The task to which this subtask is linked. Deleting the task will delete all its subtasks.
+        updated_at (datetime): Time of the last change, set automatically.
     """
     
     is_done = models.BooleanField(default=False)
     description = models.TextField(max_length=200)
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks')
\ No newline at end of file
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='subtasks')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = BulkSignalQuerySet.as_manager()
\ No newline at end of file
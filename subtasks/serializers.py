@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from join_backend.serializers import TimedSerializerMixin, ValuesSerializer
 from .models import Subtask
 
-class SubtaskSerializer(serializers.ModelSerializer):
+class SubtaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Subtask model, converting instances to/from JSON.
     
@@ -10,7 +11,7 @@ class SubtaskSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Subtask
-        fields = '__all__'
+        exclude = ['updated_at'] # internal, used for ETags
         extra_kwargs = {
             'task': {'required': False}, # not required for nested creation
             }
@@ -29,4 +30,23 @@ class SubtaskSerializer(serializers.ModelSerializer):
         """
         validated_data.pop('task', None)  # Remove 'task' from the validated data as it should not be modified
         return super().update(instance, validated_data)
-        
\ No newline at end of file
+        
+
+class NestedSubtaskSerializer(SubtaskSerializer):
+    """
+    Serializer for Subtasks nested in a Task.
+
+    Accepts the id of an existing subtask, so a nested update can change the
+    subtask in place instead of replacing it.
+    """
+    id = serializers.IntegerField(required=False)
+
+    class Meta(SubtaskSerializer.Meta):
+        pass
+
+
+class SubtaskValuesSerializer(ValuesSerializer):
+    """
+    Read-only serializer with the output of SubtaskSerializer, built from values rows.
+    """
+    fields = ['id', 'is_done', 'description', 'task']
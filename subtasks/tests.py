@@ -1,5 +1,6 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
+from django.test import override_settings
 from django.urls import reverse
 from .models import Subtask
 from tasks.models import Task
@@ -46,10 +47,14 @@ class SubtaskAPITests(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(Subtask.objects.count(), 2)
-        subtask_ids = [subtask['id'] for subtask in response.data]
+        subtask_ids = [subtask['id'] for subtask in response.data['results']]
         self.assertIn(subtask1.id, subtask_ids)
         self.assertIn(subtask2.id, subtask_ids)
         
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast_response = self.client.get(url, format='json')
+        self.assertEqual(fast_response.content, response.content)
+        
     
     def test_user_can_get_subtask_detail(self):
         """
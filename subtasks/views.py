@@ -1,12 +1,13 @@
 from django.shortcuts import render
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from users.authentication import CachedTokenAuthentication
 from .models import Subtask
-from .serializers import SubtaskSerializer
+from join_backend.mixins import ValuesListMixin
+from .serializers import SubtaskSerializer, SubtaskValuesSerializer
 
 # Create your views here.
-class SubtaskViewSet(viewsets.ModelViewSet):
+class SubtaskViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Subtask instances.
 
@@ -16,6 +17,7 @@ class SubtaskViewSet(viewsets.ModelViewSet):
     
     queryset = Subtask.objects.all()
     serializer_class = SubtaskSerializer
+    values_serializer_class = SubtaskValuesSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     
\ No newline at end of file
@@ -0,0 +1,35 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from sync.models import Change
+
+
+class Command(BaseCommand):
+    """
+    Management command deleting old entries of the change log.
+
+    Clients syncing from a revision before the remaining entries get 410 Gone
+    and reload the board. The newest entry is always kept, so the log still
+    tells which revisions were pruned.
+
+    Usage::
+
+        python manage.py prune_changes [--days 30]
+    """
+    help = 'Delete change log entries older than SYNC_RETENTION_DAYS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SYNC_RETENTION_DAYS, help='Age in days of the entries to delete.')
+
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative.')
+        newest = Change.objects.order_by('-pk').values_list('pk', flat=True).first()
+        if newest is None:
+            self.stdout.write(self.style.SUCCESS('Deleted 0 changes.'))
+            return
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Change.objects.filter(created_at__lt=cutoff, pk__lt=newest).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} changes.'))
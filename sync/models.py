@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class Change(models.Model):
+    """
+    An entry of the change log used for incremental sync.
+
+    The id of an entry is its revision: it grows with every change, so clients
+    can ask for everything that changed after the last revision they have seen.
+
+    Attributes:
+        model (str): The kind of object that changed (choices: 'task', 'subtask', 'contact').
+        object_id (int): The id of the changed object.
+        action (str): What happened to the object (choices: 'save', 'delete').
+        created_at (datetime): Time of the change.
+    """
+    MODEL_CHOICES = [
+        ('task', 'Task'),
+        ('subtask', 'Subtask'),
+        ('contact', 'Contact'),
+    ]
+    
+    ACTION_CHOICES = [
+        ('save', 'Save'),
+        ('delete', 'Delete'),
+    ]
+    
+    model = models.CharField(choices=MODEL_CHOICES, max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(choices=ACTION_CHOICES, max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,68 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from join_backend.signals import post_bulk_save
+from tasks.models import Task
+from subtasks.models import Subtask
+from contacts.models import Contact
+from .models import Change
+
+CHANGE_MODELS = {
+    Task: 'task',
+    Subtask: 'subtask',
+    Contact: 'contact',
+}
+
+
+def record_changes(sender, instances, action):
+    """
+    Log a change of the given instances with a single insert.
+
+    A changed Subtask also changes the nested representation of its Task, so
+    the Task is logged as saved as well.
+    """
+    changes = [Change(model=CHANGE_MODELS[sender], object_id=instance.pk, action=action) for instance in instances]
+    if sender is Subtask:
+        task_ids = {instance.task_id for instance in instances}
+        changes += [Change(model='task', object_id=task_id, action='save') for task_id in task_ids]
+    Change.objects.bulk_create(changes)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=Contact)
+def log_saved_instance(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Task, Subtask or Contact instance is saved.
+    """
+    record_changes(sender, [instance], 'save')
+
+
+@receiver(post_bulk_save, sender=Task)
+@receiver(post_bulk_save, sender=Subtask)
+@receiver(post_bulk_save, sender=Contact)
+def log_bulk_saved_instances(sender, instances, **kwargs):
+    """
+    Signal handler that is triggered after Task, Subtask or Contact instances are bulk created or updated.
+    """
+    record_changes(sender, instances, 'save')
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=Contact)
+def log_deleted_instance(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Task, Subtask or Contact instance is deleted.
+    """
+    record_changes(sender, [instance], 'delete')
+
+
+@receiver(pre_delete, sender=Contact)
+def log_tasks_of_deleted_contact(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered before a Contact instance is deleted.
+
+    The tasks assigned to the contact lose an assignee, so they are logged as saved.
+    """
+    task_ids = Task.assigned_to.through.objects.filter(contact_id=instance.pk).values_list('task_id', flat=True)
+    Change.objects.bulk_create([Change(model='task', object_id=task_id, action='save') for task_id in task_ids])
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from users.models import CustomUser
+from tasks.models import Task
+from subtasks.models import Subtask
+from contacts.models import Contact
+from .models import Change
+
+
+class SyncAPITests(APITestCase):
+    
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='sync_user', password='password', email='sync_user@mail.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('sync')
+        self.task = Task.objects.create(title='Task', description='Description', due_date='2030-07-22', category='Technical Task')
+        
+    
+    def sync(self, since=None):
+        response = self.client.get(self.url, {} if since is None else {'since': since}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    
+    def test_sync_without_since_returns_revision(self):
+        """
+        Ensure a sync without revision only returns the current revision.
+        """
+        data = self.sync()
+        self.assertEqual(data['revision'], Change.objects.latest('pk').pk)
+        self.assertEqual(data['tasks'], [])
+        
+        # unauthorized attempt
+        self.client.credentials()
+        response = self.client.get(self.url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    
+    def test_sync_returns_changes_since_revision(self):
+        """
+        Ensure a sync returns the objects changed since the given revision only.
+        """
+        revision = self.sync()['revision']
+        self.assertEqual(self.sync(revision)['tasks'], [])
+        
+        other_task = Task.objects.create(title='Other Task', description='Description', due_date='2030-07-22', category='User Story')
+        subtask = Subtask.objects.create(task=self.task, description='Subtask')
+        contact = Contact.objects.create(name='Sync Contact', email='sync@mail.com')
+        data = self.sync(revision)
+        
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.pk, other_task.pk]) # the subtask changed self.task
+        self.assertEqual(data['tasks'][0]['subtasks'][0]['id'], subtask.pk)
+        self.assertEqual([subtask['id'] for subtask in data['subtasks']], [subtask.pk])
+        self.assertEqual([contact['id'] for contact in data['contacts']], [contact.pk])
+        self.assertEqual(data['deleted'], {'tasks': [], 'subtasks': [], 'contacts': []})
+        self.assertGreater(data['revision'], revision)
+        self.assertEqual(self.sync(data['revision'])['tasks'], [])
+        
+    
+    def test_sync_returns_deleted_ids(self):
+        """
+        Ensure deleted objects are returned as tombstones.
+        """
+        subtask = Subtask.objects.create(task=self.task, description='Subtask')
+        contact = Contact.objects.create(name='Sync Contact', email='sync@mail.com')
+        other_task = Task.objects.create(title='Other Task', description='Description', due_date='2030-07-22', category='User Story')
+        other_task.assigned_to.add(contact)
+        revision = self.sync()['revision']
+        task_id, subtask_id, contact_id = self.task.pk, subtask.pk, contact.pk
+        
+        self.task.delete()
+        contact.delete()
+        data = self.sync(revision)
+        
+        self.assertEqual(data['deleted'], {'tasks': [task_id], 'subtasks': [subtask_id], 'contacts': [contact_id]})
+        self.assertEqual([task['id'] for task in data['tasks']], [other_task.pk]) # lost its assignee
+        self.assertEqual(data['tasks'][0]['assigned_to'], [])
+        
+    
+    def test_sync_includes_bulk_changes(self):
+        """
+        Ensure changes made with bulk queries are part of the sync.
+        """
+        revision = self.sync()['revision']
+        response = self.client.post(reverse('task-bulk'), {'update': [{'id': self.task.pk, 'status': 'done'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse('contact-import-contacts'), [{'name': 'Imported', 'email': 'imported@mail.com'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        data = self.sync(revision)
+        self.assertEqual(data['tasks'][0]['status'], 'done')
+        self.assertEqual([contact['id'] for contact in data['contacts']], response.data['created'])
+        
+    
+    def test_sync_rejects_invalid_revision(self):
+        """
+        Ensure the revision has to be a number.
+        """
+        response = self.client.get(self.url, {'since': 'yesterday'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+    
+    @override_settings(SYNC_MAX_CHANGES=2)
+    def test_sync_pages_changes(self):
+        """
+        Ensure a sync returns at most SYNC_MAX_CHANGES log entries and tells the client to continue.
+        """
+        revision = self.sync()['revision']
+        contacts = [Contact.objects.create(name=f'Sync Contact {i}', email=f'sync{i}@mail.com') for i in range(3)]
+        
+        data = self.sync(revision)
+        self.assertTrue(data['has_more'])
+        self.assertEqual([contact['id'] for contact in data['contacts']], [contacts[0].pk, contacts[1].pk])
+        data = self.sync(data['revision'])
+        self.assertFalse(data['has_more'])
+        self.assertEqual([contact['id'] for contact in data['contacts']], [contacts[2].pk])
+        self.assertEqual(data['revision'], Change.objects.latest('pk').pk)
+        
+    
+    def test_sync_stops_before_uncommitted_changes(self):
+        """
+        Ensure a sync doesn't pass a missing revision that may still be committed, until it is old enough to be rolled back.
+        """
+        revision = self.sync()['revision']
+        first = Contact.objects.create(name='First', email='first@mail.com')
+        gap = Change.objects.create(model='contact', object_id=0, action='save')
+        Change.objects.filter(pk=gap.pk).delete() # like an entry of a transaction that isn't committed yet
+        last = Contact.objects.create(name='Last', email='last@mail.com')
+        
+        data = self.sync(revision)
+        self.assertEqual([contact['id'] for contact in data['contacts']], [first.pk])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self.sync()['revision'], data['revision'])
+        
+        Change.objects.filter(pk__gt=gap.pk).update(created_at=timezone.now() - timedelta(minutes=1))
+        data = self.sync(data['revision'])
+        self.assertIn(last.pk, [contact['id'] for contact in data['contacts']])
+        self.assertEqual(data['revision'], Change.objects.latest('pk').pk)
+        self.assertEqual(self.sync()['revision'], data['revision'])
+        
+    
+    def test_prune_changes(self):
+        """
+        Ensure old log entries are pruned and syncing from a pruned revision answers 410 Gone.
+        """
+        old_revision = self.sync()['revision']
+        Change.objects.update(created_at=timezone.now() - timedelta(days=40))
+        Contact.objects.create(name='Sync Contact', email='sync@mail.com')
+        revision = self.sync()['revision']
+        Contact.objects.create(name='Other Contact', email='other@mail.com')
+        
+        call_command('prune_changes', stdout=StringIO())
+        self.assertFalse(Change.objects.filter(pk__lte=old_revision).exists())
+        response = self.client.get(self.url, {'since': old_revision - 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual([contact['name'] for contact in self.sync(revision)['contacts']], ['Other Contact'])
+        
+        # the newest entry is kept
+        Change.objects.update(created_at=timezone.now() - timedelta(days=40))
+        call_command('prune_changes', stdout=StringIO())
+        self.assertEqual(Change.objects.count(), 1)
@@ -0,0 +1,147 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from users.authentication import CachedTokenAuthentication
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from subtasks.models import Subtask
+from subtasks.serializers import SubtaskSerializer
+from contacts.models import Contact
+from contacts.serializers import ContactSerializer
+from .models import Change
+
+
+class RevisionExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The changes since this revision were pruned from the change log, reload the board.'
+    default_code = 'revision_expired'
+
+
+class SyncView(APIView):
+    """
+    View returning the tasks, subtasks and contacts changed since a revision.
+
+    Query parameters:
+        since: The last revision the client has seen. Without it, only the current
+            revision is returned, to be used as starting point for the next sync.
+
+    The response contains the revision it is complete up to, the changed
+    objects in their usual representation, the ids of deleted objects and
+    whether more changes follow:
+    `{"revision": 42, "has_more": false, "tasks": [...], "subtasks": [...], "contacts": [...],
+    "deleted": {"tasks": [...], "subtasks": [...], "contacts": [...]}}`
+
+    A response covers at most SYNC_MAX_CHANGES log entries, with `has_more`
+    the client continues with the returned revision right away. A revision
+    older than the pruned part of the log is answered with 410 Gone.
+
+    Revisions are ids of the log, which are assigned when a change is written,
+    not when it is committed. A missing id may therefore belong to a
+    transaction that is still running, so a response ends before a missing
+    id until the entry after it is SYNC_SETTLE_SECONDS old. After that, the
+    id is taken to be rolled back. Transactions writing changes have to
+    finish within SYNC_SETTLE_SECONDS.
+
+    Methods:
+        get_revision(): Returns the revision all earlier changes are committed for.
+        get_changes(since): Returns the next changes after a revision.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+    
+    sync_models = {
+        'task': ('tasks', Task.objects.prefetch_related('assigned_to', 'subtasks'), TaskSerializer),
+        'subtask': ('subtasks', Subtask.objects.all(), SubtaskSerializer),
+        'contact': ('contacts', Contact.objects.all(), ContactSerializer),
+    }
+    
+    
+    def get(self, request):
+        if 'since' not in request.query_params:
+            return Response(self.get_data(self.get_revision(), False))
+        try:
+            since = int(request.query_params['since'])
+        except ValueError:
+            raise ValidationError({'since': 'Enter a revision number.'})
+        
+        oldest = Change.objects.aggregate(oldest=Min('pk'))['oldest']
+        if oldest is not None and since < oldest - 1:
+            raise RevisionExpired()
+        changes, revision, has_more = self.get_changes(since)
+        data = self.get_data(revision, has_more)
+        changed_ids = {model: set() for model in self.sync_models}
+        for model, object_id in changes:
+            changed_ids[model].add(object_id)
+        
+        for model, (key, queryset, serializer_class) in self.sync_models.items():
+            if not changed_ids[model]:
+                continue
+            objects = list(queryset.filter(pk__in=changed_ids[model]).order_by('pk'))
+            data[key] = serializer_class(objects, many=True, context={'request': request}).data
+            # objects that don't exist anymore were deleted
+            data['deleted'][key] = sorted(changed_ids[model] - {obj.pk for obj in objects})
+        return Response(data)
+    
+    
+    def get_data(self, revision, has_more):
+        data = {'revision': revision, 'has_more': has_more, 'deleted': {}}
+        for key, _, _ in self.sync_models.values():
+            data[key] = []
+            data['deleted'][key] = []
+        return data
+    
+    
+    def get_settled_before(self):
+        """
+        Return the time before which every change is committed or rolled back.
+        """
+        return timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    
+    
+    def get_revision(self):
+        """
+        Return the latest revision without a missing id before it that may still be committed.
+        """
+        settled_before = self.get_settled_before()
+        revision = 0
+        recent = []
+        # only the entries of the last SYNC_SETTLE_SECONDS are read
+        for pk, created_at in Change.objects.order_by('-pk').values_list('pk', 'created_at').iterator():
+            if created_at <= settled_before:
+                revision = pk
+                break
+            recent.append(pk)
+        for pk in reversed(recent):
+            if pk != revision + 1:
+                break
+            revision = pk
+        return revision
+    
+    
+    def get_changes(self, since):
+        """
+        Return the (model, object_id) pairs of the log entries after `since`,
+        the revision they reach and whether more entries can be read now.
+
+        Stops after SYNC_MAX_CHANGES entries or before a missing id that may
+        belong to a running transaction.
+        """
+        settled_before = self.get_settled_before()
+        limit = settings.SYNC_MAX_CHANGES
+        entries = list(
+            Change.objects.filter(pk__gt=since).order_by('pk').values_list('pk', 'model', 'object_id', 'created_at')[:limit + 1]
+        )
+        changes = []
+        revision = since
+        for pk, model, object_id, created_at in entries[:limit]:
+            if pk != revision + 1 and created_at > settled_before:
+                return changes, revision, False
+            changes.append((model, object_id))
+            revision = pk
+        return changes, revision, len(entries) > limit
@@ -0,0 +1,97 @@
+import csv
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+from .serializers import TaskSerializer
+
+CSV_COLUMNS = ['id', 'title', 'description', 'status', 'priority', 'due_date', 'category', 'assigned_to', 'subtasks']
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """
+    File-like object returning what is written to it, so csv.writer produces strings.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_chunks(queryset, chunk_size):
+    """
+    Yield the tasks of the queryset in lists of up to `chunk_size`.
+    Rows are fetched chunk by chunk and prefetch_related runs once per chunk.
+    """
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def task_csv_row(task):
+    """
+    Return the CSV row of a task. Assignees are listed by name, subtasks with
+    a check box like `[x] Done subtask; [ ] Open subtask`.
+    """
+    return [
+        task.pk,
+        task.title,
+        task.description,
+        task.status,
+        task.priority,
+        task.due_date,
+        task.category,
+        '; '.join(contact.name for contact in task.assigned_to.all()),
+        '; '.join(f"[{'x' if subtask.is_done else ' '}] {subtask.description}" for subtask in task.subtasks.all()),
+    ]
+
+
+def export_csv(queryset, chunk_size, context):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for tasks in iter_chunks(queryset, chunk_size):
+        yield ''.join(writer.writerow(task_csv_row(task)) for task in tasks)
+
+
+def export_ndjson(queryset, chunk_size, context):
+    for tasks in iter_chunks(queryset, chunk_size):
+        data = TaskSerializer(tasks, many=True, context=context).data
+        yield ''.join(json.dumps(task, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n' for task in data)
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+}
+
+
+async def aiterate(iterator):
+    """
+    Iterate a synchronous iterator from async code, one item per thread hop.
+    """
+    sentinel = object()
+    while (item := await sync_to_async(next)(iterator, sentinel)) is not sentinel:
+        yield item
+
+
+def stream_export(request, queryset, export_format, chunk_size, context):
+    """
+    Return a StreamingHttpResponse with the tasks of the queryset as CSV or NDJSON.
+
+    Only one chunk of tasks is held in memory at a time. Django consumes
+    synchronous iterators completely when serving them via ASGI and
+    asynchronous ones via WSGI, so the content is iterated in the mode of the
+    handler serving the request.
+    """
+    content = EXPORTERS[export_format](queryset, chunk_size, context)
+    if isinstance(request, ASGIRequest):
+        content = aiterate(content)
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="tasks.{export_format}"'
+    return response
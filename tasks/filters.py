@@ -0,0 +1,60 @@
+from datetime import date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .models import Task
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filter backend narrowing down Tasks by query parameters.
+
+    Query parameters:
+        status, priority, category: Exact match, several values can be separated by commas.
+        due_date: Tasks due on the given date (YYYY-MM-DD).
+        due_date_after, due_date_before: Tasks due on or after / on or before the given date.
+        assigned_to: Tasks assigned to the Contact with the given id.
+
+    Invalid values are rejected with a validation error.
+    """
+    choice_filters = {
+        'status': [value for value, _ in Task.STATUS_CHOICES],
+        'priority': [str(value) for value, _ in Task.PRIORITY_CHOICES],
+        'category': [value for value, _ in Task.CATEGORY_CHOICES],
+    }
+    date_filters = {
+        'due_date': 'due_date',
+        'due_date_after': 'due_date__gte',
+        'due_date_before': 'due_date__lte',
+    }
+    
+    
+    def filter_queryset(self, request, queryset, view):
+        """
+        Return the queryset filtered by the query parameters of the request.
+        """
+        params = request.query_params
+        
+        for field, choices in self.choice_filters.items():
+            if params.get(field):
+                values = params[field].split(',')
+                invalid_values = [value for value in values if value not in choices]
+                if invalid_values:
+                    raise ValidationError({field: f'Invalid values {invalid_values}, choose from {choices}.'})
+                queryset = queryset.filter(**{f'{field}__in': values})
+        
+        for param, lookup in self.date_filters.items():
+            if params.get(param):
+                try:
+                    value = date.fromisoformat(params[param])
+                except ValueError:
+                    raise ValidationError({param: 'Enter a date in the format YYYY-MM-DD.'})
+                queryset = queryset.filter(**{lookup: value})
+        
+        if params.get('assigned_to'):
+            try:
+                contact_id = int(params['assigned_to'])
+            except ValueError:
+                raise ValidationError({'assigned_to': 'Enter the id of a contact.'})
+            queryset = queryset.filter(assigned_to=contact_id)
+        
+        return queryset
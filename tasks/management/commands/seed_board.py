@@ -0,0 +1,43 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from users.models import CustomUser
+from tasks.seeding import BoardSeeder
+
+
+class Command(BaseCommand):
+    """
+    Management command filling the database with a generated board for
+    profiling and capacity planning.
+
+    The same seed and date generate the same rows. Rows are inserted without
+    the change log, so clients should reload the board instead of syncing.
+    Running servers with a per-process cache may show the old board summary
+    until it times out, see BoardSeeder.
+
+    Usage::
+
+        python manage.py seed_board --users 1000 --contacts 10000 --tasks 1000000 [--seed 0]
+    """
+    help = 'Generate users, contacts, tasks, subtasks and assignments with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Users to create, each with a contact.')
+        parser.add_argument('--contacts', type=int, default=100, help='Contacts without user to create.')
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks to create, with subtasks and assignees.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated values.')
+        parser.add_argument('--today', type=date.fromisoformat, default=None, help='Reference date of the due dates (YYYY-MM-DD), today by default.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows inserted per transaction.')
+        parser.add_argument('--password', default='password', help='Password of all generated users.')
+
+
+    def handle(self, *args, **options):
+        seeder = BoardSeeder(seed=options['seed'], today=options['today'], chunk_size=options['chunk_size'], password=options['password'])
+        if CustomUser.objects.filter(email__endswith=f'.s{seeder.seed}@example.com').exists():
+            raise CommandError(f'The database was already seeded with seed {seeder.seed}, use another --seed.')
+
+        start = time.perf_counter()
+        counts = seeder.seed_board(users=options['users'], contacts=options['contacts'], tasks=options['tasks'])
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(f'{count} {kind}' for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Created {summary} in {elapsed:.1f}s.'))
@@ -1,4 +1,5 @@
 from django.db import models
+from join_backend.managers import BulkSignalQuerySet
 from contacts.models import Contact
 
 class Task(models.Model):
@@ -13,6 +14,10 @@ class Task(models.Model):
         due_date (date): Due date for task completion.
         category (str): Category of the task (choices: 'Technical Task', 'User Story').
         assigned_to (ManyToManyField): Contacts assigned to the task.
+        updated_at (datetime): Time of the last change, set automatically.
+
+    The composite indexes serve the board columns (status) and the urgent and
+    upcoming widgets (priority), which filter by a choice and sort by due date.
     """
     PRIORITY_CHOICES = [
         (1, 'Urgent'),
@@ -39,4 +44,13 @@ class Task(models.Model):
     due_date = models.DateField()
     category = models.CharField(choices=CATEGORY_CHOICES, max_length=20)
     assigned_to = models.ManyToManyField(Contact, related_name='tasks', blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = BulkSignalQuerySet.as_manager()
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date']),
+            models.Index(fields=['priority', 'due_date']),
+            models.Index(fields=['category', 'due_date']),
+        ]
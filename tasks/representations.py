@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.db import transaction
+
+REPRESENTATION_CACHE_TIMEOUT = 60 * 60 # frees entries of tasks that aren't read anymore
+
+
+def representation_cache_key(task_id):
+    """
+    Return the cache key of the serialized representation of a task.
+    """
+    return f'tasks:representation:{task_id}'
+
+
+def representation_version(task):
+    """
+    Return the version of the representation of a task: the `updated_at` of
+    the task and of its subtasks and the ids of its subtasks and assignees,
+    in the order they are serialized in.
+
+    Every change of the representation changes the version, also changes
+    made without signals or by another process. The subtasks and assignees
+    are read from the prefetched objects the representation is built from.
+    """
+    return (
+        task.updated_at,
+        tuple((subtask.pk, subtask.updated_at) for subtask in task.subtasks.all()),
+        tuple(contact.pk for contact in task.assigned_to.all()),
+    )
+
+
+def get_representations(tasks, serialize):
+    """
+    Return the representations of the tasks, serializing only the tasks that
+    aren't cached at their current version.
+
+    Every entry stores the representation_version of the task it was made
+    from, so an entry of another version of the task is never returned, even
+    if it was written after an invalidation by a request that read the task
+    before a concurrent change. Invalidation only frees outdated entries early.
+
+    Args:
+        tasks (list): The Task instances.
+        serialize (callable): Returns the representation of a Task.
+    """
+    keys = {task.pk: representation_cache_key(task.pk) for task in tasks}
+    cached = cache.get_many(keys.values())
+    
+    representations = []
+    missing = {}
+    for task in tasks:
+        version = representation_version(task)
+        entry = cached.get(keys[task.pk])
+        if entry is not None and entry[0] == version:
+            representations.append(entry[1])
+            continue
+        data = serialize(task)
+        missing[keys[task.pk]] = (version, data)
+        representations.append(data)
+    
+    if missing:
+        cache.set_many(missing, REPRESENTATION_CACHE_TIMEOUT)
+    return representations
+
+
+def invalidate_representations(task_ids):
+    """
+    Drop the cached representations of the tasks now and again once the current
+    transaction commits, so a representation of uncommitted data can't stay in the cache.
+    """
+    keys = [representation_cache_key(task_id) for task_id in set(task_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
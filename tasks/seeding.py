@@ -0,0 +1,277 @@
+import random
+import string
+from itertools import accumulate
+from datetime import date, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+from contacts.models import Contact
+from subtasks.models import Subtask
+from sync.models import Change
+from users.models import CustomUser
+from users.utils import generate_initials
+from .models import Task
+from .summary import invalidate_board_summary
+
+FIRST_NAMES = [
+    'Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hannah', 'Ivan', 'Julia',
+    'Karl', 'Lena', 'Max', 'Nina', 'Oskar', 'Paula', 'Quentin', 'Rosa', 'Sofia', 'Tom',
+]
+LAST_NAMES = [
+    'Bauer', 'Becker', 'Fischer', 'Hoffmann', 'Koch', 'Meyer', 'Müller', 'Richter', 'Schäfer', 'Schmidt',
+    'Schneider', 'Schulz', 'Wagner', 'Weber', 'Wolf',
+]
+VERBS = ['Implement', 'Fix', 'Refactor', 'Design', 'Review', 'Document', 'Test', 'Deploy', 'Update', 'Plan']
+SUBJECTS = [
+    'login form', 'board view', 'contact list', 'drag and drop', 'task export', 'search', 'API pagination',
+    'summary page', 'user settings', 'mobile layout', 'error messages', 'onboarding', 'notifications',
+]
+DETAILS = [
+    'Follow the design in the style guide.', 'Check the edge cases with empty input.',
+    'Coordinate with the frontend team.', 'Add tests for the new behaviour.',
+    'Keep the old behaviour behind a flag until the release.', 'Measure before and after the change.',
+]
+
+
+def distribution(weights):
+    """
+    Return the values and cumulative weights of (value, weight) pairs, for rng.choices.
+    """
+    values, value_weights = zip(*weights)
+    return values, list(accumulate(value_weights))
+
+
+def draw(rng, distribution):
+    values, cum_weights = distribution
+    return rng.choices(values, cum_weights=cum_weights)[0]
+
+
+# roughly the shape of a board in daily use
+STATUSES = distribution([('to-do', 35), ('in-progress', 25), ('await-feedback', 15), ('done', 25)])
+PRIORITIES = distribution([(1, 20), (2, 55), (3, 25)])
+CATEGORIES = distribution([('Technical Task', 60), ('User Story', 40)])
+ASSIGNEE_COUNTS = distribution([(0, 10), (1, 45), (2, 30), (3, 10), (4, 5)])
+SUBTASK_COUNTS = distribution([(0, 30), (1, 15), (2, 20), (3, 20), (4, 10), (5, 5)])
+# share of done subtasks by the status of their task
+SUBTASK_DONE_RATES = {'to-do': 0.1, 'in-progress': 0.5, 'await-feedback': 0.8, 'done': 1.0}
+
+
+def plain(model):
+    """
+    Return a queryset of the model without post_bulk_save, so seeding doesn't
+    fill the change log or publish events for every generated row.
+    """
+    return models.QuerySet(model)
+
+
+TASK_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'due_date', 'category', 'updated_at']
+SUBTASK_FIELDS = ['task', 'description', 'is_done', 'updated_at']
+ASSIGNMENT_FIELDS = ['task', 'contact']
+
+
+def last_task_id():
+    """
+    Return the highest id a task ever had, as far as the database still knows.
+
+    Besides the existing tasks, this covers deleted tasks that still have
+    entries in the change log, so a seeded task never takes the id of a task
+    that sync clients were told was deleted, and on SQLite the AUTOINCREMENT
+    counter, which also remembers deleted tasks without entries.
+    """
+    last_ids = [
+        Task.objects.aggregate(last_id=Max('pk'))['last_id'],
+        Change.objects.filter(model='task').aggregate(last_id=Max('object_id'))['last_id'],
+    ]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [Task._meta.db_table])
+            row = cursor.fetchone()
+        last_ids.append(row[0] if row else None)
+    return max((last_id for last_id in last_ids if last_id is not None), default=0)
+
+
+def insert_rows(model, fields, rows):
+    """
+    Insert tuples of database values for the given fields with one executemany.
+
+    Used for the tasks, subtasks and assignments, where building model
+    instances and compiling bulk_create would take most of the time.
+    """
+    if not rows:
+        return
+    columns = ', '.join(connection.ops.quote_name(model._meta.get_field(field).column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
+
+
+class BoardSeeder:
+    """
+    Generates users, contacts, tasks, subtasks and assignments with bulk inserts.
+
+    Rows are inserted without signals, so neither the change log nor the
+    cached representations and summary are updated per row. The seeder drops
+    the cached summary once done; with a per-process cache like the default
+    LocMemCache, running servers keep theirs until it times out after
+    SUMMARY_CACHE_TIMEOUT or they are restarted. Cached representations are
+    versioned by the data they were made from, so they can't go stale.
+
+    All values are drawn from a random.Random seeded with `seed`, and due dates
+    are relative to `today`, so the same seed and date produce the same rows.
+    Tasks are generated and inserted `chunk_size` at a time with their
+    subtasks and assignments, so memory use doesn't grow with the task count.
+    Users and contacts are inserted with bulk_create, the far more numerous
+    tasks, subtasks and assignments as plain rows with insert_rows.
+
+    Every user gets a contact like on registration, the other contacts have no
+    user. Assignees are skewed towards a few busy contacts. All users share
+    `password` and its hash, so seeding doesn't spend its time hashing.
+
+    Attributes:
+        rng (random.Random): Source of all generated values.
+        today (date): Reference date of the due dates.
+        chunk_size (int): Number of tasks inserted at a time.
+        contact_ids (list): Ids of the generated contacts, for the assignments.
+        counts (dict): Number of inserted rows per kind.
+    """
+
+    def __init__(self, seed=0, today=None, chunk_size=5000, password='password'):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.chunk_size = chunk_size
+        self.password = password
+        self.contact_ids = []
+        self.counts = {'users': 0, 'contacts': 0, 'tasks': 0, 'subtasks': 0, 'assignments': 0}
+
+
+    def name(self):
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+
+    def email(self, name, kind, index):
+        # the seed keeps the emails of different seeds apart
+        local = name.lower().replace(' ', '.').replace('ü', 'ue').replace('ä', 'ae')
+        return f'{local}.{kind}{index}.s{self.seed}@example.com'
+
+
+    def seed_users(self, count):
+        """
+        Insert `count` users with a contact each.
+        """
+        salt = ''.join(self.rng.choices(string.ascii_letters + string.digits, k=22))
+        password = make_password(self.password, salt)
+        for start in range(0, count, self.chunk_size):
+            users = []
+            for index in range(start, min(start + self.chunk_size, count)):
+                name = self.name()
+                users.append(CustomUser(
+                    username=name, email=self.email(name, 'user', index), initials=generate_initials(name), password=password,
+                ))
+            with transaction.atomic():
+                users = plain(CustomUser).bulk_create(users)
+                self.add_contacts([
+                    Contact(name=user.username, email=user.email, active_user=user) for user in users
+                ])
+            self.counts['users'] += len(users)
+
+
+    def seed_contacts(self, count):
+        """
+        Insert `count` contacts without user.
+        """
+        for start in range(0, count, self.chunk_size):
+            contacts = []
+            for index in range(start, min(start + self.chunk_size, count)):
+                name = self.name()
+                phone = f'+49 {self.rng.randrange(150, 180)} {self.rng.randrange(1000000, 9999999)}' if self.rng.random() < 0.6 else None
+                contacts.append(Contact(name=name, email=self.email(name, 'contact', index), phone=phone))
+            with transaction.atomic():
+                self.add_contacts(contacts)
+
+
+    def add_contacts(self, contacts):
+        for contact in contacts:
+            contact.initials = generate_initials(contact.name)
+            contact.badge_color = self.rng.randrange(15)
+        contacts = plain(Contact).bulk_create(contacts)
+        self.contact_ids += [contact.pk for contact in contacts]
+        self.counts['contacts'] += len(contacts)
+
+
+    def task(self, task_id, updated_at):
+        """
+        Return the values of a new task in the order of TASK_FIELDS.
+        """
+        status = draw(self.rng, STATUSES)
+        if status == 'done':
+            due_date = self.today - timedelta(days=self.rng.randrange(0, 90))
+        else:
+            # mostly the coming weeks, some overdue
+            due_date = self.today + timedelta(days=round(self.rng.triangular(-14, 90, 10)))
+        verb, subject = self.rng.choice(VERBS), self.rng.choice(SUBJECTS)
+        return (
+            task_id,
+            f'{verb} {subject}',
+            f'{verb} the {subject}. {self.rng.choice(DETAILS)}',
+            status,
+            draw(self.rng, PRIORITIES),
+            connection.ops.adapt_datefield_value(due_date),
+            draw(self.rng, CATEGORIES),
+            updated_at,
+        )
+
+
+    def seed_tasks(self, count):
+        """
+        Insert `count` tasks with their subtasks and assignments.
+
+        The tasks get consecutive ids after last_task_id(), so subtasks and
+        assignments can refer to them without reading them back. The database
+        must not get other tasks while seeding.
+        """
+        # a few contacts are busy, most have a few tasks
+        assignees = distribution([(contact_id, 1 / rank ** 0.8) for rank, contact_id in enumerate(self.contact_ids, 1)]) if self.contact_ids else None
+        task_id = last_task_id()
+        for start in range(0, count, self.chunk_size):
+            updated_at = connection.ops.adapt_datetimefield_value(timezone.now())
+            tasks = []
+            subtasks = []
+            assignments = []
+            for _ in range(min(self.chunk_size, count - start)):
+                task_id += 1
+                task = self.task(task_id, updated_at)
+                tasks.append(task)
+                done_rate = SUBTASK_DONE_RATES[task[3]]
+                for number in range(draw(self.rng, SUBTASK_COUNTS)):
+                    subtasks.append((task_id, f'Step {number + 1}: {self.rng.choice(DETAILS)}', self.rng.random() < done_rate, updated_at))
+                if assignees:
+                    contact_ids = set(self.rng.choices(assignees[0], cum_weights=assignees[1], k=draw(self.rng, ASSIGNEE_COUNTS)))
+                    assignments += [(task_id, contact_id) for contact_id in sorted(contact_ids)]
+            with transaction.atomic():
+                insert_rows(Task, TASK_FIELDS, tasks)
+                insert_rows(Subtask, SUBTASK_FIELDS, subtasks)
+                insert_rows(Task.assigned_to.through, ASSIGNMENT_FIELDS, assignments)
+            self.counts['tasks'] += len(tasks)
+            self.counts['subtasks'] += len(subtasks)
+            self.counts['assignments'] += len(assignments)
+        if not count:
+            return
+        # like loaddata, e.g. on PostgreSQL the id sequence doesn't see explicit ids
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Task]):
+                cursor.execute(sql)
+        invalidate_board_summary()
+
+
+    def seed_board(self, users=0, contacts=0, tasks=0):
+        """
+        Insert the users with their contacts, the other contacts and the tasks.
+        Returns the number of inserted rows per kind.
+        """
+        self.seed_users(users)
+        self.seed_contacts(contacts)
+        self.seed_tasks(tasks)
+        return self.counts
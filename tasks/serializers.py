@@ -1,21 +1,51 @@
 from rest_framework import serializers
 from .models import Task
 from contacts.models import Contact
-from subtasks.serializers import SubtaskSerializer
+from collections import defaultdict
+from join_backend.metrics import timed_serialization
+from join_backend.serializers import TimedSerializerMixin, ValuesSerializer
+from subtasks.serializers import NestedSubtaskSerializer, SubtaskValuesSerializer
 from subtasks.models import Subtask
 from django.db import transaction
+from .representations import get_representations
 
-class TaskSerializer(serializers.ModelSerializer):
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    List serializer answering Tasks from the representation cache.
+
+    The cache is read and filled with a single call each for the whole list,
+    which is timed as a whole, cache lookups included.
+    """
+    
+    def to_representation(self, data):
+        return timed_serialization(self.represent, data)
+    
+    
+    def represent(self, data):
+        tasks = list(data.all() if hasattr(data, 'all') else data)
+        if not self.child.use_representation_cache():
+            return [self.child.to_representation(task) for task in tasks]
+        return get_representations(tasks, self.child.serialize)
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Task model, converting instances to/from JSON.
 
     Attributes:
         assigned_to (PrimaryKeyRelatedField): Optional field for associating multiple Contacts with the Task.
-        subtasks (SubtaskSerializer): Optional field for managing nested Subtasks.
+        subtasks (NestedSubtaskSerializer): Optional field for managing nested Subtasks.
+
+    Representations are cached per Task, see tasks.representations.
 
     Methods:
+        to_representation(instance): Returns the cached representation or builds it with serialize().
+        validate(attrs): Ensures nested Subtask ids belong to the Task being updated.
         create(validated_data): Creates a new Task instance and associated Subtasks.
         update(instance, validated_data): Updates an existing Task instance and associated Subtasks.
+        update_subtasks(instance, subtasks_data): Reconciles the Subtasks of a Task with nested subtask data.
+        create_subtasks(instance, subtasks_data): Creates the nested Subtasks of a Task in a single query.
     """
     
     
@@ -25,12 +55,53 @@ class TaskSerializer(serializers.ModelSerializer):
         required = False
     )
     
-    subtasks = SubtaskSerializer(many=True, required=False)
+    subtasks = NestedSubtaskSerializer(many=True, required=False)
     
     class Meta:
         model = Task
-        fields = '__all__'
+        exclude = ['updated_at'] # internal, used for ETags
+        list_serializer_class = TaskListSerializer
+        
+    
+    def use_representation_cache(self):
+        """
+        Only cache representations when reading. After a write, the prefetched
+        Subtasks and assignees of the instance may be outdated.
+        """
+        return not hasattr(self.root, 'initial_data')
+    
+    
+    def to_representation(self, instance):
+        """
+        Return the representation of the Task, from the representation cache if possible.
+        """
+        if not self.use_representation_cache():
+            return self.serialize(instance)
+        return get_representations([instance], self.serialize)[0]
+    
+    
+    def serialize(self, instance):
+        """
+        Build the representation of the Task, bypassing the cache.
+        """
+        return super().to_representation(instance)
+        
+        
+    def validate(self, attrs):
+        """
+        Ensure nested Subtask ids are unique and belong to the Task being updated.
+        """
+        subtask_ids = [subtask['id'] for subtask in attrs.get('subtasks', []) if 'id' in subtask]
+        if len(subtask_ids) != len(set(subtask_ids)):
+            raise serializers.ValidationError({'subtasks': 'Subtask ids must be unique.'})
         
+        existing_ids = {subtask.pk for subtask in self.instance.subtasks.all()} if self.instance else set()
+        unknown_ids = set(subtask_ids) - existing_ids
+        if unknown_ids:
+            raise serializers.ValidationError({'subtasks': f'Subtasks {sorted(unknown_ids)} do not belong to this task.'})
+        return attrs
+    
+    
     def create(self, validated_data):
         """
         Create a new Task instance, including nested Subtasks.
@@ -47,9 +118,8 @@ class TaskSerializer(serializers.ModelSerializer):
             if assigned_to_data:
                 task.assigned_to.set(assigned_to_data)
             
-            # Create nested Subtasks
-            for subtask_data in subtasks_data:
-                Subtask.objects.create(task=task, **subtask_data)
+            # Create nested Subtasks in a single query
+            self.create_subtasks(task, subtasks_data)
         
         return task
     
@@ -58,10 +128,12 @@ class TaskSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """
         Update an existing Task instance and its associated Subtasks.
+        
+        Subtasks are only touched if 'subtasks' is part of the request.
         """
         
         assigned_to_data = validated_data.pop('assigned_to', [])
-        subtasks_data = validated_data.pop('subtasks', [])
+        subtasks_data = validated_data.pop('subtasks', None)
     
         with transaction.atomic():
             # Update the Task instance
@@ -71,10 +143,278 @@ class TaskSerializer(serializers.ModelSerializer):
             if assigned_to_data:
                 instance.assigned_to.set(assigned_to_data) 
         
-            # Replace existing Subtasks
-            instance.subtasks.all().delete()
-            for subtask_data in subtasks_data:
-                subtask_data['task'] = instance
-                Subtask.objects.create(**subtask_data)
+            # Reconcile existing Subtasks
+            if subtasks_data is not None:
+                self.update_subtasks(instance, subtasks_data)
+    
+        return instance
+    
+    
+    def update_subtasks(self, instance, subtasks_data):
+        """
+        Reconcile the Subtasks of a Task with the nested subtask data.
+
+        Subtasks with a known id are kept and only written if they changed,
+        subtasks without id are created and subtasks missing from the data
+        are deleted. Each of these steps runs as a single batched query.
+        """
+        existing_subtasks = {subtask.pk: subtask for subtask in instance.subtasks.all()}
+        subtasks_to_create = []
+        subtasks_to_update = []
+        
+        for subtask_data in subtasks_data:
+            subtask_data = dict(subtask_data)
+            subtask_id = subtask_data.pop('id', None)
+            subtask_data.pop('task', None) # nested subtasks always belong to this task
+            
+            if subtask_id is None:
+                subtasks_to_create.append(subtask_data)
+                continue
+            
+            subtask = existing_subtasks.pop(subtask_id)
+            changed = False
+            for attr, value in subtask_data.items():
+                if getattr(subtask, attr) != value:
+                    setattr(subtask, attr, value)
+                    changed = True
+            if changed:
+                subtasks_to_update.append(subtask)
+        
+        if existing_subtasks:
+            Subtask.objects.filter(pk__in=existing_subtasks.keys()).delete()
+        if subtasks_to_update:
+            Subtask.objects.bulk_update(subtasks_to_update, ['description', 'is_done'])
+        if subtasks_to_create:
+            self.create_subtasks(instance, subtasks_to_create)
+    
+    
+    def create_subtasks(self, instance, subtasks_data):
+        """
+        Create the nested Subtasks of a Task with a single bulk insert.
+
+        Returns:
+            list: The created Subtask instances, including their ids.
+        """
+        subtasks = []
+        for subtask_data in subtasks_data:
+            subtask_data = dict(subtask_data)
+            subtask_data.pop('id', None) # new subtasks get a new id
+            subtask_data.pop('task', None) # nested subtasks always belong to this task
+            subtasks.append(Subtask(task=instance, **subtask_data))
+        return Subtask.objects.bulk_create(subtasks)
+
+
+class TaskValuesSerializer(ValuesSerializer):
+    """
+    Read-only serializer with the output of TaskSerializer, built from values rows.
+
+    The assigned Contact ids and the Subtasks of all rows are fetched with one
+    query each, ordered by id like the prefetches of TaskViewSet.
+    """
+    fields = ['id', 'status', 'title', 'description', 'priority', 'due_date', 'category']
+    
     
-        return instance
\ No newline at end of file
+    def to_representation(self, rows):
+        rows = list(rows)
+        task_ids = [row['id'] for row in rows]
+        
+        assigned_to = defaultdict(list)
+        assignments = Task.assigned_to.through.objects.filter(task_id__in=task_ids).order_by('contact_id').values_list('task_id', 'contact_id')
+        for task_id, contact_id in assignments:
+            assigned_to[task_id].append(contact_id)
+        
+        subtasks = defaultdict(list)
+        subtask_serializer = SubtaskValuesSerializer()
+        subtask_rows = subtask_serializer.get_rows(Subtask.objects.filter(task_id__in=task_ids).order_by('pk'))
+        for subtask in subtask_serializer.to_representation(subtask_rows):
+            subtasks[subtask['task']].append(subtask)
+        
+        return [
+            {
+                'id': row['id'],
+                'assigned_to': assigned_to[row['id']],
+                'subtasks': subtasks[row['id']],
+                'status': row['status'],
+                'title': row['title'],
+                'description': row['description'],
+                'priority': row['priority'],
+                'due_date': row['due_date'].isoformat(),
+                'category': row['category'],
+            }
+            for row in rows
+        ]
+
+
+class TaskBulkSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Serializer for applying many Task creates, partial updates and deletes at once.
+
+    Fields:
+        create (TaskSerializer): Tasks to create.
+        update (list): Partial updates, each containing the 'id' of the Task to update.
+        delete (list): Ids of the Tasks to delete.
+
+    Methods:
+        get_fields(): Declares the create, update and delete fields.
+        validate_update(value): Validates each partial update against its Task.
+        validate_delete(value): Ensures all Tasks to delete exist.
+        create(validated_data): Applies all changes with bulk queries in a single transaction.
+        to_representation(instance): Returns the created and updated Tasks and the deleted ids.
+    """
+    
+    def get_fields(self):
+        """
+        Declare the fields here, as 'create' and 'update' would shadow the serializer methods.
+        """
+        return {
+            'create': TaskSerializer(many=True, required=False),
+            'update': serializers.ListField(child=serializers.DictField(), required=False),
+            'delete': serializers.ListField(child=serializers.IntegerField(), required=False),
+        }
+    
+    
+    def validate_update(self, value):
+        """
+        Validate each partial update with a TaskSerializer bound to its Task.
+
+        Returns:
+            list: (Task, validated_data) pairs in request order.
+        """
+        task_ids = []
+        for item in value:
+            try:
+                task_ids.append(int(item['id']))
+            except (KeyError, TypeError, ValueError):
+                task_ids.append(None)
+        if len(set(task_ids)) != len(task_ids):
+            raise serializers.ValidationError('Every update needs the id of a different task.')
+        tasks = Task.objects.prefetch_related('assigned_to', 'subtasks').in_bulk([task_id for task_id in task_ids if task_id is not None])
+        
+        updates = []
+        errors = []
+        for task_id, item in zip(task_ids, value):
+            task = tasks.get(task_id)
+            if task is None:
+                errors.append({'id': ['A valid task id is required.' if task_id is None else f'Task {task_id} does not exist.']})
+                continue
+            serializer = TaskSerializer(task, data=item, partial=True, context=self.context)
+            if serializer.is_valid():
+                updates.append((task, serializer.validated_data))
+                errors.append({})
+            else:
+                errors.append(serializer.errors)
+        
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return updates
+    
+    
+    def validate_delete(self, value):
+        """
+        Ensure all Tasks to delete exist.
+        """
+        missing_ids = set(value) - set(Task.objects.filter(pk__in=value).values_list('pk', flat=True))
+        if missing_ids:
+            raise serializers.ValidationError(f'Tasks {sorted(missing_ids)} do not exist.')
+        return value
+    
+    
+    def validate(self, attrs):
+        """
+        Ensure no Task is updated and deleted in the same request.
+        """
+        updated_ids = {task.pk for task, _ in attrs.get('update', [])}
+        if updated_ids & set(attrs.get('delete', [])):
+            raise serializers.ValidationError('A task can not be updated and deleted in the same request.')
+        return attrs
+    
+    
+    def create(self, validated_data):
+        """
+        Apply all creates, updates and deletes in a single transaction.
+        """
+        with transaction.atomic():
+            created_tasks = self.create_tasks(validated_data.get('create', []))
+            updated_tasks = self.update_tasks(validated_data.get('update', []))
+            deleted_ids = validated_data.get('delete', [])
+            if deleted_ids:
+                Task.objects.filter(pk__in=deleted_ids).delete()
+        
+        tasks = Task.objects.prefetch_related('assigned_to', 'subtasks').in_bulk([task.pk for task in created_tasks + updated_tasks])
+        return {
+            'created': [tasks[task.pk] for task in created_tasks],
+            'updated': [tasks[task.pk] for task in updated_tasks],
+            'deleted': deleted_ids,
+        }
+    
+    
+    def create_tasks(self, tasks_data):
+        """
+        Create Tasks, their assigned Contacts and their Subtasks with one bulk insert each.
+        """
+        tasks = []
+        for task_data in tasks_data:
+            task_data = dict(task_data)
+            task_data.pop('assigned_to', None)
+            task_data.pop('subtasks', None)
+            tasks.append(Task(**task_data))
+        tasks = Task.objects.bulk_create(tasks)
+        
+        assignments = []
+        subtasks = []
+        for task, task_data in zip(tasks, tasks_data):
+            for contact in task_data.get('assigned_to', []):
+                assignments.append(Task.assigned_to.through(task_id=task.pk, contact_id=contact.pk))
+            for subtask_data in task_data.get('subtasks', []):
+                subtask_data = dict(subtask_data)
+                subtask_data.pop('id', None)
+                subtask_data.pop('task', None)
+                subtasks.append(Subtask(task=task, **subtask_data))
+        Task.assigned_to.through.objects.bulk_create(assignments)
+        Subtask.objects.bulk_create(subtasks)
+        return tasks
+    
+    
+    def update_tasks(self, updates):
+        """
+        Apply partial updates to Tasks with a single bulk update for the Task fields,
+        which also marks Tasks as updated whose assignees or Subtasks changed.
+
+        Assigned Contacts are replaced with one delete and one insert for all Tasks.
+        Nested Subtasks are reconciled per Task.
+        """
+        fields = set()
+        assignments = {}
+        for task, task_data in updates:
+            task_data = dict(task_data)
+            if 'assigned_to' in task_data:
+                assignments[task.pk] = task_data.pop('assigned_to')
+            subtasks_data = task_data.pop('subtasks', None)
+            if subtasks_data is not None:
+                TaskSerializer(context=self.context).update_subtasks(task, subtasks_data)
+            for attr, value in task_data.items():
+                setattr(task, attr, value)
+            fields.update(task_data)
+        
+        tasks = [task for task, _ in updates]
+        if tasks:
+            Task.objects.bulk_update(tasks, fields) # also sets updated_at
+        if assignments:
+            Task.assigned_to.through.objects.filter(task_id__in=assignments.keys()).delete()
+            Task.assigned_to.through.objects.bulk_create([
+                Task.assigned_to.through(task_id=task_id, contact_id=contact.pk)
+                for task_id, contacts in assignments.items()
+                for contact in contacts
+            ])
+        return tasks
+    
+    
+    def to_representation(self, instance):
+        """
+        Represent the result of a bulk request with the serialized Tasks in request order.
+        """
+        return {
+            'created': TaskSerializer(instance['created'], many=True, context=self.context).data,
+            'updated': TaskSerializer(instance['updated'], many=True, context=self.context).data,
+            'deleted': instance['deleted'],
+        }
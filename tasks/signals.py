@@ -0,0 +1,59 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from join_backend.signals import post_bulk_save
+from subtasks.models import Subtask
+from .models import Task
+from .summary import invalidate_board_summary
+from .representations import invalidate_representations
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_bulk_save, sender=Task)
+def invalidate_summary(sender, **kwargs):
+    """
+    Signal handler that is triggered after Task instances are saved or deleted.
+
+    This function drops the cached board summary.
+    """
+    invalidate_board_summary()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def invalidate_task_representation(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Task or Subtask instance is saved or deleted.
+
+    This function drops the cached representation of the Task.
+    """
+    invalidate_representations([instance.pk if sender is Task else instance.task_id])
+
+
+@receiver(post_bulk_save, sender=Task)
+@receiver(post_bulk_save, sender=Subtask)
+def invalidate_task_representations(sender, instances, **kwargs):
+    """
+    Signal handler that is triggered after Task or Subtask instances are bulk created or updated.
+
+    This function drops the cached representations of the Tasks.
+    """
+    invalidate_representations([instance.pk if sender is Task else instance.task_id for instance in instances])
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def invalidate_assigned_task_representations(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Signal handler that is triggered when the assigned Contacts of Tasks change.
+
+    This function drops the cached representations of the affected Tasks. When
+    the Tasks of a Contact are cleared, they are looked up before the clear.
+    """
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_representations([instance.pk])
+    elif reverse and action in ('post_add', 'post_remove'):
+        invalidate_representations(pk_set)
+    elif reverse and action == 'pre_clear':
+        invalidate_representations(instance.tasks.values_list('pk', flat=True))
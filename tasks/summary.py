@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from .models import Task
+
+SUMMARY_CACHE_KEY = 'tasks:summary'
+SUMMARY_CACHE_TIMEOUT = 60 * 5 # safety net, the summary is invalidated on every task change
+
+
+def get_board_summary():
+    """
+    Return the board summary, computing and caching it if it isn't cached yet.
+    """
+    summary = cache.get(SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = compute_board_summary()
+        cache.set(SUMMARY_CACHE_KEY, summary, SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def compute_board_summary():
+    """
+    Compute the board summary with a single query grouped by status.
+
+    Returns:
+        dict: The total number of tasks, the number of tasks per status, the number
+        of urgent tasks that aren't done and the earliest due date among them.
+    """
+    rows = (
+        Task.objects.order_by()
+        .values('status')
+        .annotate(
+            count=Count('id'),
+            urgent=Count('id', filter=Q(priority=1)),
+            upcoming_deadline=Min('due_date', filter=Q(priority=1)),
+        )
+    )
+    
+    summary = {
+        'total': 0,
+        'status': {status: 0 for status, _ in Task.STATUS_CHOICES},
+        'urgent': 0,
+        'upcoming_deadline': None,
+    }
+    for row in rows:
+        summary['total'] += row['count']
+        summary['status'][row['status']] = row['count']
+        if row['status'] == 'done':
+            continue
+        summary['urgent'] += row['urgent']
+        if row['upcoming_deadline'] and (summary['upcoming_deadline'] is None or row['upcoming_deadline'] < summary['upcoming_deadline']):
+            summary['upcoming_deadline'] = row['upcoming_deadline']
+    return summary
+
+
+def invalidate_board_summary():
+    """
+    Drop the cached board summary now and again once the current transaction commits,
+    so a summary computed from uncommitted data can't stay in the cache.
+    """
+    cache.delete(SUMMARY_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(SUMMARY_CACHE_KEY))
@@ -1,11 +1,28 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date
+from unittest.mock import patch
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from django.urls import reverse
+from django.urls import reverse, resolve
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from users.models import CustomUser
+from contacts.models import Contact
 from .models import Task
+from .views import TaskViewSet
+from .representations import representation_cache_key
 from subtasks.models import Subtask
+from sync.models import Change
 
 class TaskModelTest(TestCase):  
     def test_task_model_exists(self):
@@ -113,8 +130,8 @@ class TaskTests(BaseAPITestCase):
         response = self.client.get(url, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Get All')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Get All')
         
         # unauthorized attempt
         self.client.logout()
@@ -219,5 +236,733 @@ class TaskTests(BaseAPITestCase):
         task = self.createTask(**data)
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_get_tasks_query_count_is_constant(self):
+        """
+        Ensure listing tasks doesn't run extra queries per task for assignees and subtasks.
+        """
+        self.authenticate()
+        self.client.get(reverse('task-list')) # caches the token, so all measured requests authenticate alike
+        contact = Contact.objects.create(name='Query Contact', email='query@mail.de')
+        url = reverse('task-list')
+
+        def create_tasks(count):
+            for i in range(count):
+                self.createTask(**self.data(f'Task {i}', assigned_to=[contact.pk], subtasks=[{'description': 'Subtask'}, {'description': 'Subtask 2'}]))
+
+        create_tasks(1)
+        with CaptureQueriesContext(connection) as few_tasks:
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        create_tasks(10)
+        with CaptureQueriesContext(connection) as many_tasks:
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 11)
+        self.assertEqual(response.data['results'][-1]['assigned_to'], [contact.pk])
+        self.assertEqual(len(response.data['results'][-1]['subtasks']), 2)
+        self.assertEqual(len(many_tasks), len(few_tasks))
+        
+        
+    def test_update_task_reconciles_subtasks(self):
+        """
+        Ensure a task update keeps, updates, creates and deletes subtasks by id.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Test Subtasks', subtasks=[{'description': 'Keep'}, {'description': 'Change'}, {'description': 'Remove'}]))
+        keep, change, remove = task.subtasks.order_by('id')
+        url = reverse('task-detail', args=[task.id])
+        subtasks = [
+            {'id': keep.pk, 'description': 'Keep', 'is_done': False},
+            {'id': change.pk, 'description': 'Change', 'is_done': True},
+            {'description': 'New', 'is_done': False},
+        ]
+        response = self.client.patch(url, {'subtasks': subtasks}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Subtask.objects.filter(task=task).count(), 3)
+        self.assertFalse(Subtask.objects.filter(pk=remove.pk).exists())
+        change.refresh_from_db()
+        self.assertTrue(change.is_done)
+        response_subtasks = {subtask['description']: subtask for subtask in response.data['subtasks']}
+        self.assertEqual(response_subtasks['Keep']['id'], keep.pk) # id is stable
+        self.assertEqual(response_subtasks['Change']['id'], change.pk) # id is stable
+        self.assertNotIn(response_subtasks['New']['id'], [keep.pk, change.pk, remove.pk])
+        
+        
+    def test_update_task_rejects_foreign_subtask_ids(self):
+        """
+        Ensure subtasks of other tasks can't be changed through a task update.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Task'))
+        other_task = self.createTask(**self.data('Other Task', subtasks=[{'description': 'Other Subtask'}]))
+        other_subtask = other_task.subtasks.get()
+        url = reverse('task-detail', args=[task.id])
+        response = self.client.patch(url, {'subtasks': [{'id': other_subtask.pk, 'description': 'Stolen'}]}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        other_subtask.refresh_from_db()
+        self.assertEqual(other_subtask.task, other_task)
+        self.assertEqual(other_subtask.description, 'Other Subtask')
+        
+        
+    def test_partial_update_task_keeps_subtasks(self):
+        """
+        Ensure a partial update without subtasks leaves the subtasks untouched.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Test Keep Subtasks', subtasks=[{'description': 'Subtask'}]))
+        subtask = task.subtasks.get()
+        url = reverse('task-detail', args=[task.id])
+        response = self.client.patch(url, {'status': 'done'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(task.subtasks.values_list('id', flat=True)), [subtask.pk])
+        
         
-        
\ No newline at end of file
+    def test_update_subtasks_query_count_is_constant(self):
+        """
+        Ensure ticking one subtask costs the same number of queries regardless of the number of subtasks.
+        """
+        self.authenticate()
+        self.client.get(reverse('task-list')) # caches the token, so all measured requests authenticate alike
+        
+        def tick_first_subtask(subtask_count):
+            task = self.createTask(**self.data('Task', subtasks=[{'description': f'Subtask {i}'} for i in range(subtask_count)]))
+            subtasks = [{'id': subtask.pk, 'description': subtask.description, 'is_done': subtask.is_done} for subtask in task.subtasks.order_by('id')]
+            subtasks[0]['is_done'] = True
+            url = reverse('task-detail', args=[task.id])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.patch(url, {'subtasks': subtasks}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(task.subtasks.filter(is_done=True).count(), 1)
+            return len(queries)
+        
+        self.assertEqual(tick_first_subtask(3), tick_first_subtask(30))
+        
+        
+    def test_create_task_subtasks_query_count_is_constant(self):
+        """
+        Ensure nested subtasks are created with a single query and returned with their ids.
+        """
+        self.authenticate()
+        self.client.get(reverse('task-list')) # caches the token, so all measured requests authenticate alike
+        url = reverse('task-list')
+        
+        def create_task(subtask_count):
+            data = self.data('Task', subtasks=[{'description': f'Subtask {i}'} for i in range(subtask_count)])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            subtask_ids = [subtask['id'] for subtask in response.data['subtasks']]
+            self.assertEqual(sorted(subtask_ids), sorted(Subtask.objects.filter(task=response.data['id']).values_list('id', flat=True)))
+            self.assertEqual(len(subtask_ids), subtask_count)
+            return len(queries)
+        
+        self.assertEqual(create_task(2), create_task(20))
+        
+        
+    def test_bulk_create_update_delete_tasks(self):
+        """
+        Ensure tasks can be created, partially updated and deleted in a single request.
+        """
+        self.authenticate()
+        contact = Contact.objects.create(name='Bulk Contact', email='bulk@mail.de')
+        task_to_update = self.createTask(**self.data('Update', subtasks=[{'description': 'Subtask'}]))
+        task_to_move = self.createTask(**self.data('Move'))
+        task_to_delete = self.createTask(**self.data('Delete'))
+        url = reverse('task-bulk')
+        data = {
+            'create': [self.data('Created', assigned_to=[contact.pk], subtasks=[{'description': 'New Subtask'}])],
+            'update': [
+                {'id': task_to_update.pk, 'title': 'Updated', 'assigned_to': [contact.pk]},
+                {'id': task_to_move.pk, 'status': 'done'},
+            ],
+            'delete': [task_to_delete.pk],
+        }
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(response.data['created'][0]['title'], 'Created')
+        self.assertEqual(response.data['created'][0]['assigned_to'], [contact.pk])
+        self.assertEqual(response.data['created'][0]['subtasks'][0]['description'], 'New Subtask')
+        self.assertEqual([task['id'] for task in response.data['updated']], [task_to_update.pk, task_to_move.pk])
+        self.assertEqual(response.data['deleted'], [task_to_delete.pk])
+        
+        task_to_update.refresh_from_db()
+        task_to_move.refresh_from_db()
+        self.assertEqual(task_to_update.title, 'Updated')
+        self.assertEqual(list(task_to_update.assigned_to.all()), [contact])
+        self.assertEqual(task_to_update.subtasks.count(), 1) # not updated
+        self.assertEqual(task_to_move.status, 'done')
+        self.assertEqual(task_to_move.title, 'Move') # not updated
+        self.assertFalse(Task.objects.filter(pk=task_to_delete.pk).exists())
+        
+        # unauthorized attempt
+        self.client.logout()
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        
+    def test_bulk_tasks_is_atomic(self):
+        """
+        Ensure nothing is applied when a single item of a bulk request is invalid.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Task'))
+        url = reverse('task-bulk')
+        data = {
+            'create': [self.data('Created')],
+            'update': [{'id': task.pk, 'status': 'done'}, {'id': task.pk + 100, 'status': 'done'}],
+            'delete': [task.pk + 200],
+        }
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['update'][0], {})
+        self.assertIn('id', response.data['update'][1])
+        self.assertIn('delete', response.data)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'to-do')
+        self.assertEqual(Task.objects.count(), 1)
+        
+        
+    def test_bulk_move_tasks_query_count_is_constant(self):
+        """
+        Ensure moving many tasks costs the same number of queries as moving a few.
+        """
+        self.authenticate()
+        self.client.get(reverse('task-list')) # caches the token, so all measured requests authenticate alike
+        url = reverse('task-bulk')
+        
+        def move_tasks(count):
+            tasks = [self.createTask(**self.data(f'Task {i}')) for i in range(count)]
+            data = {'update': [{'id': task.pk, 'status': 'in-progress'} for task in tasks]}
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(Task.objects.filter(pk__in=[task.pk for task in tasks], status='in-progress').count(), count)
+            return len(queries)
+        
+        self.assertEqual(move_tasks(2), move_tasks(20))
+        
+        
+    def test_get_tasks_is_paginated(self):
+        """
+        Ensure the task list is split into cursor pages of the requested size.
+        """
+        self.authenticate()
+        tasks = [self.createTask(**self.data(f'Task {i}')) for i in range(5)]
+        url = reverse('task-list')
+        response = self.client.get(url, {'page_size': 2}, format='json')
+        
+        task_ids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            task_ids += [task['id'] for task in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'], format='json')
+        
+        self.assertEqual(task_ids, [task.pk for task in tasks])
+        
+        
+    def test_filter_tasks(self):
+        """
+        Ensure tasks can be filtered by status, priority, category, due date and assignee.
+        """
+        self.authenticate()
+        contact = Contact.objects.create(name='Filter Contact', email='filter@mail.de')
+        urgent_todo = self.createTask(**self.data('Urgent', status='to-do', priority=1, due_date='2030-01-10', assigned_to=[contact.pk]))
+        medium_done = self.createTask(**self.data('Medium', status='done', priority=2, due_date='2030-02-10', category='User Story'))
+        low_progress = self.createTask(**self.data('Low', status='in-progress', priority=3, due_date='2030-03-10'))
+        url = reverse('task-list')
+        
+        def filtered_ids(**params):
+            response = self.client.get(url, params, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [task['id'] for task in response.data['results']]
+        
+        self.assertEqual(filtered_ids(status='to-do'), [urgent_todo.pk])
+        self.assertEqual(filtered_ids(status='to-do,done'), [urgent_todo.pk, medium_done.pk])
+        self.assertEqual(filtered_ids(priority='1'), [urgent_todo.pk])
+        self.assertEqual(filtered_ids(category='User Story'), [medium_done.pk])
+        self.assertEqual(filtered_ids(due_date='2030-02-10'), [medium_done.pk])
+        self.assertEqual(filtered_ids(due_date_after='2030-02-01'), [medium_done.pk, low_progress.pk])
+        self.assertEqual(filtered_ids(due_date_after='2030-02-01', due_date_before='2030-02-28'), [medium_done.pk])
+        self.assertEqual(filtered_ids(assigned_to=contact.pk), [urgent_todo.pk])
+        self.assertEqual(filtered_ids(search='Medi'), [medium_done.pk])
+        self.assertEqual(filtered_ids(ordering='-due_date'), [low_progress.pk, medium_done.pk, urgent_todo.pk])
+        
+        
+    def test_filter_tasks_rejects_invalid_values(self):
+        """
+        Ensure invalid filter values are rejected.
+        """
+        self.authenticate()
+        url = reverse('task-list')
+        for params in ({'status': 'unknown'}, {'priority': '7'}, {'due_date_after': 'tomorrow'}, {'assigned_to': 'me'}):
+            response = self.client.get(url, params, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        
+        
+    def test_get_tasks_not_modified(self):
+        """
+        Ensure the task list answers with 304 as long as no task or subtask changed.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Test ETag', subtasks=[{'description': 'Subtask'}]))
+        url = reverse('task-list')
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertNotIn('Last-Modified', response)
+        
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        
+        # a changed subtask changes the ETag
+        self.client.patch(reverse('subtask-detail', args=[task.subtasks.get().pk]), {'is_done': True}, format='json')
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        
+        # a changed assignee changes the ETag
+        contact = Contact.objects.create(name='ETag Contact', email='etag@mail.de')
+        self.client.patch(reverse('task-detail', args=[task.pk]), {'assigned_to': [contact.pk]}, format='json')
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        # a deleted assignee changes the ETag
+        contact.delete()
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['assigned_to'], [])
+        
+        # filters have their own ETag
+        response = self.client.get(url, {'status': 'done'}, format='json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        
+    def test_get_tasks_modified_after_deleting_older_task(self):
+        """
+        Ensure the task list isn't answered with 304 after a task other than the newest was deleted.
+        """
+        self.authenticate()
+        older_task = self.createTask(**self.data('Older task'))
+        self.createTask(**self.data('Newer task'))
+        url = reverse('task-list')
+        self.assertNotIn('Last-Modified', self.client.get(url, format='json'))
+        self.assertIn('Last-Modified', self.client.get(reverse('task-detail', args=[older_task.pk]), format='json'))
+        
+        older_task.delete()
+        response = self.client.get(url, format='json', HTTP_IF_MODIFIED_SINCE=http_date(timezone.now().timestamp() + 60))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['title'] for task in response.data['results']], ['Newer task'])
+        
+        
+    def test_get_task_detail_not_modified(self):
+        """
+        Ensure a task answers with 304 until it changes.
+        """
+        self.authenticate()
+        task = self.createTask(**self.data('Test ETag'))
+        url = reverse('task-detail', args=[task.pk])
+        etag = self.client.get(url, format='json')['ETag']
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 2) # only the aggregates of the task and its subtasks
+        
+        self.client.post(reverse('task-bulk'), {'update': [{'id': task.pk, 'status': 'done'}]}, format='json')
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'done')
+        
+        response = self.client.get(reverse('task-detail', args=[task.pk + 1]), format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        
+    def test_get_tasks_sync_by_default(self):
+        """
+        Ensure list and retrieve are synchronous views unless ASYNC_VIEWS is enabled, as under WSGI.
+        """
+        self.assertFalse(iscoroutinefunction(resolve(reverse('task-list')).func))
+        self.assertFalse(iscoroutinefunction(resolve(reverse('task-detail', args=[1])).func))
+        
+        
+    @override_settings(ROOT_URLCONF='join_backend.tests')
+    async def test_get_tasks_async(self):
+        """
+        Ensure list and retrieve are served by coroutines with ASYNC_VIEWS, while the other methods still work.
+        """
+        await sync_to_async(self.authenticate)()
+        headers = {'Authorization': 'Token ' + self.token.key}
+        list_url = reverse('task-list')
+        self.assertTrue(iscoroutinefunction(resolve(list_url).func))
+        self.assertFalse(iscoroutinefunction(resolve(reverse('task-summary')).func))
+        
+        response = await self.async_client.post(list_url, self.data('Test Async'), content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task_id = response.json()['id']
+        
+        response = await self.async_client.get(list_url, {'status': 'to-do'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.json()['results']], [task_id])
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast_response = await self.async_client.get(list_url, {'status': 'to-do'}, headers=headers)
+        self.assertEqual(fast_response.content, response.content)
+        response = await self.async_client.get(reverse('task-detail', args=[task_id]), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], 'Test Async')
+        response = await self.async_client.get(reverse('task-detail', args=[task_id]), headers={**headers, 'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = await self.async_client.get(reverse('task-detail', args=[task_id + 1]), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        # unauthorized attempt
+        response = await self.async_client.get(list_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        
+    def test_fast_read_serializer_output_is_identical(self):
+        """
+        Ensure task lists serialized from values rows are byte-identical to the TaskSerializer output.
+        """
+        self.authenticate()
+        contacts = [Contact.objects.create(name=f'Contact {i}', email=f'contact{i}@mail.com') for i in range(3)]
+        self.createTask(**self.data('Test Fast', assigned_to=[contacts[2].pk, contacts[0].pk], subtasks=[{'description': 'B', 'is_done': True}, {'description': 'A'}]))
+        self.createTask(**self.data('Other Task', status='done', priority=3, due_date='2030-01-01', category='User Story'))
+        url = reverse('task-list')
+        
+        for params in ({}, {'status': 'to-do'}, {'ordering': '-due_date', 'page_size': 1}, {'search': 'Other'}):
+            expected = self.client.get(url, params)
+            with override_settings(FAST_READ_SERIALIZERS=True):
+                response = self.client.get(url, params)
+            self.assertEqual(response.content, expected.content)
+        
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            self.createTask(**self.data('Third Task', assigned_to=[contacts[1].pk], subtasks=[{'description': 'C'}]))
+            with CaptureQueriesContext(connection) as more_queries:
+                self.client.get(url)
+        self.assertEqual(len(queries), len(more_queries))
+        
+        
+    def test_export_tasks(self):
+        """
+        Ensure tasks with subtasks and assignees can be exported as CSV and NDJSON.
+        """
+        self.authenticate()
+        contact = Contact.objects.create(name='Export Contact', email='export@mail.com')
+        task = self.createTask(**self.data('Test Export', assigned_to=[contact.pk], subtasks=[{'description': 'Done', 'is_done': True}, {'description': 'Open'}]))
+        self.createTask(**self.data('Other Task', status='done'))
+        
+        response = self.client.get(reverse('task-export', kwargs={'export_format': 'csv'}), {'status': 'to-do'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows, [
+            ['id', 'title', 'description', 'status', 'priority', 'due_date', 'category', 'assigned_to', 'subtasks'],
+            [str(task.pk), 'Test Export', 'Test Description', 'to-do', '1', '2030-07-22', 'Technical Task', 'Export Contact', '[x] Done; [ ] Open'],
+        ])
+        
+        response = self.client.get(reverse('task-export', kwargs={'export_format': 'ndjson'}))
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0]), self.client.get(reverse('task-detail', args=[task.pk]), format='json').json())
+        
+        # unauthorized attempt
+        self.client.credentials()
+        response = self.client.get(reverse('task-export', kwargs={'export_format': 'csv'}))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        
+    def test_export_tasks_query_count_is_constant(self):
+        """
+        Ensure the export reads the tasks in chunks with a constant number of queries per chunk.
+        """
+        self.authenticate()
+        self.client.get(reverse('task-list')) # caches the token, so all measured requests authenticate alike
+        url = reverse('task-export', kwargs={'export_format': 'ndjson'})
+        
+        def export(task_count):
+            for i in range(task_count):
+                self.createTask(**self.data(f'Task {i}', subtasks=[{'description': 'Subtask'}]))
+            with CaptureQueriesContext(connection) as queries:
+                content = b''.join(self.client.get(url).streaming_content)
+            self.assertEqual(content.count(b'\n'), Task.objects.count())
+            return len(queries)
+        
+        with patch.object(TaskViewSet, 'export_chunk_size', 10):
+            self.assertEqual(export(2), export(8))
+            self.assertEqual(export(10) + 2, export(1)) # one more chunk, prefetching assignees and subtasks
+        
+        
+    async def test_export_tasks_async(self):
+        """
+        Ensure the export is streamed asynchronously under ASGI.
+        """
+        await sync_to_async(self.authenticate)()
+        await sync_to_async(self.createTask)(**self.data('Test Export'))
+        response = await self.async_client.get(reverse('task-export', kwargs={'export_format': 'csv'}), headers={'Authorization': 'Token ' + self.token.key})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 2)
+
+
+class TaskRepresentationCacheTests(BaseAPITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.authenticate()
+        self.contact = Contact.objects.create(name='Cache Contact', email='cache@mail.com')
+        self.task = Task.objects.create(title='Task', description='Description', due_date='2030-07-22', category='Technical Task')
+        self.subtask = Subtask.objects.create(task=self.task, description='Subtask')
+        self.url = reverse('task-list')
+        
+    
+    def get_task(self):
+        response = self.client.get(self.url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['results'][0]
+        
+    
+    def test_list_uses_cached_representations(self):
+        """
+        Ensure unchanged tasks are answered from the representation cache.
+        """
+        data = self.get_task()
+        version, cached_data = cache.get(representation_cache_key(self.task.pk))
+        self.assertEqual(cached_data, data)
+        
+        cache.set(representation_cache_key(self.task.pk), (version, {**data, 'title': 'Cached'}))
+        self.assertEqual(self.get_task()['title'], 'Cached')
+        response = self.client.get(reverse('task-detail', args=[self.task.pk]), format='json')
+        self.assertEqual(response.data['title'], 'Cached')
+        
+        # an entry of an older version is ignored
+        Task.objects.filter(pk=self.task.pk).update(updated_at=timezone.now())
+        self.assertEqual(self.get_task()['title'], 'Task')
+        
+    
+    def test_changes_invalidate_cached_representations(self):
+        """
+        Ensure changes of the task, its subtasks and its assignees invalidate the cached representation.
+        """
+        self.get_task()
+        self.client.patch(reverse('subtask-detail', args=[self.subtask.pk]), {'is_done': True}, format='json')
+        self.assertTrue(self.get_task()['subtasks'][0]['is_done'])
+        
+        Subtask.objects.bulk_create([Subtask(task=self.task, description='Bulk Subtask')])
+        self.assertEqual(len(self.get_task()['subtasks']), 2)
+        
+        self.task.assigned_to.add(self.contact)
+        self.assertEqual(self.get_task()['assigned_to'], [self.contact.pk])
+        self.contact.tasks.clear()
+        self.assertEqual(self.get_task()['assigned_to'], [])
+        self.contact.tasks.add(self.task)
+        self.assertEqual(self.get_task()['assigned_to'], [self.contact.pk])
+        self.contact.delete()
+        self.assertEqual(self.get_task()['assigned_to'], [])
+        
+        self.subtask.delete()
+        self.assertEqual(len(self.get_task()['subtasks']), 1)
+        
+    
+    def test_changes_without_invalidation_are_not_served_from_cache(self):
+        """
+        Ensure a cached representation isn't used after its subtasks or assignees changed without invalidation, e.g. by another process.
+        """
+        self.get_task()
+        Subtask.objects.filter(pk=self.subtask.pk).update(is_done=True, updated_at=timezone.now()) # sends no signals
+        self.assertTrue(self.get_task()['subtasks'][0]['is_done'])
+        
+        Task.assigned_to.through.objects.create(task=self.task, contact=self.contact)
+        self.assertEqual(self.get_task()['assigned_to'], [self.contact.pk])
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {Subtask._meta.db_table} WHERE id = %s', [self.subtask.pk])
+        self.assertEqual(self.get_task()['subtasks'], [])
+        
+    
+    def test_writes_dont_fill_cache(self):
+        """
+        Ensure responses of writes are not cached.
+        """
+        response = self.client.patch(reverse('task-detail', args=[self.task.pk]), {'title': 'Changed'}, format='json')
+        self.assertEqual(response.data['title'], 'Changed')
+        self.assertIsNone(cache.get(representation_cache_key(self.task.pk)))
+        self.assertEqual(self.get_task()['title'], 'Changed')
+
+
+class TaskSummaryTests(BaseAPITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.authenticate()
+        
+        
+    def test_get_summary(self):
+        """
+        Ensure the summary counts tasks per status and the open urgent tasks.
+        """
+        TaskTests.createTask(**TaskTests.data(status='to-do', priority=1, due_date='2030-03-01'))
+        TaskTests.createTask(**TaskTests.data(status='in-progress', priority=1, due_date='2030-02-01'))
+        TaskTests.createTask(**TaskTests.data(status='in-progress', priority=2, due_date='2030-01-01'))
+        TaskTests.createTask(**TaskTests.data(status='done', priority=1, due_date='2029-01-01'))
+        url = reverse('task-summary')
+        response = self.client.get(url, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['status'], {'to-do': 1, 'in-progress': 2, 'await-feedback': 0, 'done': 1})
+        self.assertEqual(response.data['urgent'], 2) # done tasks don't count
+        self.assertEqual(str(response.data['upcoming_deadline']), '2030-02-01')
+        
+        # unauthorized attempt
+        self.client.logout()
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        
+    def test_summary_is_cached_until_tasks_change(self):
+        """
+        Ensure the summary is served from the cache and recomputed after tasks change.
+        """
+        task = TaskTests.createTask(**TaskTests.data(status='to-do'))
+        url = reverse('task-summary')
+        self.client.get(url, format='json')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, format='json')
+        self.assertFalse([query for query in queries if 'tasks_task' in query['sql']])
+        self.assertEqual(response.data['status']['to-do'], 1)
+        
+        self.client.patch(reverse('task-detail', args=[task.pk]), {'status': 'done'}, format='json')
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.data['status']['to-do'], 0)
+        self.assertEqual(response.data['status']['done'], 1)
+        
+        self.client.post(reverse('task-bulk'), {'create': [TaskTests.data()]}, format='json')
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.data['total'], 2)
+        
+        task.delete()
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.data['total'], 1)
+
+
+
+class SeedBoardTests(BaseAPITestCase):
+    
+    options = {'users': 3, 'contacts': 5, 'tasks': 30, 'seed': 7, 'today': date(2024, 6, 1), 'chunk_size': 8}
+    
+    def seed(self, **options):
+        stdout = io.StringIO()
+        call_command('seed_board', **{**self.options, **options}, stdout=stdout)
+        return stdout.getvalue()
+    
+    
+    def snapshot(self):
+        """
+        Return the generated board without ids and timestamps.
+        """
+        return [
+            (task.title, task.description, task.status, task.priority, task.due_date, task.category,
+             sorted(contact.email for contact in task.assigned_to.all()),
+             [(subtask.description, subtask.is_done) for subtask in task.subtasks.order_by('pk')])
+            for task in Task.objects.prefetch_related('assigned_to').order_by('pk')
+        ]
+        
+        
+    def test_seed_board_creates_rows(self):
+        """
+        Ensure seed_board creates the requested users, contacts and tasks.
+        """
+        output = self.seed()
+        self.assertIn('Created 3 users, 8 contacts, 30 tasks', output)
+        self.assertEqual(Task.objects.count(), 30)
+        self.assertEqual(Contact.objects.count(), 8)
+        self.assertEqual(Contact.objects.filter(active_user__isnull=False).count(), 3)
+        self.assertTrue(Subtask.objects.exists())
+        self.assertTrue(Task.assigned_to.through.objects.exists())
+        user = CustomUser.objects.exclude(contact=None).first()
+        self.assertTrue(user.check_password('password'))
+        for task in Task.objects.filter(status='done'):
+            self.assertLessEqual(task.due_date, date(2024, 6, 1))
+            
+            
+    def test_seeded_tasks_are_served(self):
+        """
+        Ensure seeded tasks can be listed and new tasks get free ids afterwards.
+        """
+        self.seed()
+        self.authenticate()
+        response = self.client.get(reverse('task-list'), {'page_size': 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 30)
+        task = Task.objects.create(title='New', description='New', due_date='2024-06-01', category='User Story')
+        self.assertGreater(task.pk, 30)
+        
+        
+    def test_seeded_tasks_skip_ids_of_deleted_tasks(self):
+        """
+        Ensure seeded tasks don't take the ids of deleted tasks still in the change log.
+        """
+        deleted = Task.objects.create(title='Deleted', description='Deleted', due_date='2024-06-01', category='User Story')
+        deleted_id = deleted.pk
+        deleted.delete()
+        self.assertTrue(Change.objects.filter(model='task', object_id=deleted_id, action='delete').exists())
+        self.seed(tasks=3)
+        self.assertGreater(Task.objects.order_by('pk').first().pk, deleted_id)
+        
+        
+    def test_seeding_drops_cached_summary(self):
+        """
+        Ensure the board summary includes the seeded tasks right after seeding.
+        """
+        self.authenticate()
+        url = reverse('task-summary')
+        self.assertEqual(self.client.get(url).data['total'], 0)
+        self.seed()
+        self.assertEqual(self.client.get(url).data['total'], 30)
+        
+        
+    def test_seed_board_is_deterministic(self):
+        """
+        Ensure the same seed and date generate the same board, another seed a different one.
+        """
+        self.seed()
+        board = self.snapshot()
+        CustomUser.objects.all().delete()
+        Contact.objects.all().delete()
+        Task.objects.all().delete()
+        self.seed(chunk_size=5)
+        self.assertEqual(self.snapshot(), board)
+        self.seed(seed=8)
+        self.assertNotEqual(self.snapshot()[30:], board)
+        
+        
+    def test_seed_board_rejects_used_seed(self):
+        """
+        Ensure seeding with the same seed twice is rejected.
+        """
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
@@ -1,19 +1,98 @@
 from django.shortcuts import render
-from rest_framework import viewsets
+from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.db.models import Count, Max, Prefetch
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from users.authentication import CachedTokenAuthentication
 
-from .serializers import TaskSerializer
+from .serializers import TaskSerializer, TaskBulkSerializer, TaskValuesSerializer
 from .models import Task
+from contacts.models import Contact
+from subtasks.models import Subtask
+from join_backend.mixins import ConditionalGetMixin, AsyncReadMixin, ReplicaReadMixin, ValuesListMixin
+from .filters import TaskFilterBackend
+from .summary import get_board_summary
+from .export import stream_export
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin, AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Task instances.
 
     Provides standard CRUD operations with token authentication.
     Only authenticated users can modify tasks.
+    The queryset prefetches assigned contacts and subtasks ordered by id, so a
+    list response costs a constant number of queries regardless of the number
+    of tasks and lists related objects in a stable order.
+
+    The list can be filtered with the query parameters of TaskFilterBackend,
+    searched in title and description with `search` and sorted with `ordering`.
+    The same filters apply to the streaming CSV and NDJSON export.
+    List and detail responses carry an ETag, detail responses a Last-Modified
+    header as well, both also cover the nested subtasks. Under ASGI, list and retrieve run as coroutines.
     """
-    queryset = Task.objects.all()
+    queryset = Task.objects.prefetch_related(
+        Prefetch('assigned_to', queryset=Contact.objects.order_by('pk')),
+        Prefetch('subtasks', queryset=Subtask.objects.order_by('pk')),
+    )
     serializer_class = TaskSerializer
+    values_serializer_class = TaskValuesSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    filter_backends = [TaskFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['title', 'description']
+    ordering_fields = ['id', 'due_date', 'priority', 'status', 'title']
+    ordering = ['id']
+    export_chunk_size = 500
+    
+    
+    def get_validator_aggregates(self, queryset):
+        """
+        Aggregate the tasks and, in a second query, their subtasks, so subtask
+        changes change the ETag as well. Aggregating the subtasks separately
+        avoids a join of every task with its subtasks.
+        """
+        aggregates = queryset.aggregate(count=Count('pk'), updated_at=Max('updated_at'))
+        subtask_aggregates = Subtask.objects.filter(task__in=queryset.values('pk')).aggregate(
+            subtask_count=Count('pk'),
+            subtask_updated_at=Max('updated_at'),
+        )
+        return {**aggregates, **subtask_aggregates}
+    
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create, partially update and delete many tasks in a single transaction.
+
+        Expects a body like ``{"create": [...], "update": [{"id": 1, ...}], "delete": [2, 3]}``
+        and returns the created and updated tasks in request order and the deleted ids.
+        """
+        serializer = TaskBulkSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+    
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Return the task counts per status, the number of urgent open tasks and their
+        earliest due date. The summary is cached until a task changes.
+        """
+        return Response(get_board_summary())
+    
+    
+    @action(detail=False, methods=['get'], url_path=r'export\.(?P<export_format>csv|ndjson)')
+    def export(self, request, export_format):
+        """
+        Stream the tasks with their subtasks and assignees as CSV or NDJSON file.
+
+        Tasks are read in chunks of `export_chunk_size`, so memory use doesn't
+        grow with the size of the board. NDJSON lines have the same format as
+        the task API.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        # stick to the database chosen for this request, the response is streamed after it returned
+        queryset = queryset.using(queryset.db)
+        return stream_export(request._request, queryset, export_format, self.export_chunk_size, self.get_serializer_context())
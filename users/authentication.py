@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_ALIAS = 'tokens'
+
+
+def token_cache_key(key):
+    """
+    Return the cache key for the given token key.
+    """
+    return f'auth:token:{key}'
+
+
+def invalidate_cached_tokens(user):
+    """
+    Remove the cached tokens of the given user, e.g. after the user changed.
+    """
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    caches[TOKEN_CACHE_ALIAS].delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that caches the token and its user.
+
+    The lookup of token and user only hits the database on a cache miss. The
+    `tokens` cache is a bounded LRU with a TTL (see CACHES in the settings);
+    entries are invalidated when a token is deleted or its user is saved, e.g.
+    after a password change or deactivation.
+
+    With several worker processes, point the `tokens` cache to a shared backend
+    so invalidations reach every process.
+    """
+    
+    def authenticate_credentials(self, key):
+        """
+        Return the user and token for the given key, from the cache if possible.
+        """
+        cache = caches[TOKEN_CACHE_ALIAS]
+        token = cache.get(token_cache_key(key))
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(token_cache_key(key), token)
+        return (token.user, token)
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.signals import user_login_failed
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    """
+    Raised when more password hashes are pending than PASSWORD_HASHING_MAX_PENDING.
+    The response asks the client to retry after `wait` seconds.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many sign-ins at the moment, please try again shortly.')
+    default_code = 'hashing_pool_busy'
+    wait = 1
+
+
+class HashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    PBKDF2 and scrypt release the GIL while hashing, so the workers hash in
+    parallel while the event loop and the request threads keep serving other
+    requests. At most `max_pending` hashes may be queued or running; beyond
+    that `run` raises HashingPoolBusy instead of letting the queue grow.
+
+    Attributes:
+        max_workers (int): Number of hashes computed at the same time.
+        max_pending (int): Number of hashes queued or running at most.
+        pending (int): Number of hashes queued or running.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='password-hashing')
+
+
+    def release(self, future):
+        with self.lock:
+            self.pending -= 1
+
+
+    async def run(self, func, *args):
+        """
+        Run func(*args) in the pool and return its result.
+        """
+        with self.lock:
+            if self.pending >= self.max_pending:
+                raise HashingPoolBusy()
+            self.pending += 1
+        future = self.executor.submit(func, *args)
+        # the slot is freed when the hash is done, even if the request was cancelled
+        future.add_done_callback(self.release)
+        return await asyncio.wrap_future(future)
+
+
+@lru_cache(maxsize=None)
+def get_hashing_pool():
+    """
+    Return the hashing pool of the process, sized by the settings.
+    """
+    return HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_MAX_PENDING)
+
+
+async def ahash_password(raw_password):
+    """
+    Return the hash of the password with the preferred hasher, computed in the hashing pool.
+    """
+    return await get_hashing_pool().run(make_password, raw_password)
+
+
+def setup_worker():
+    """
+    Initialize Django in a worker process of a process pool hashing passwords.
+    """
+    import django
+    django.setup()
+
+
+def hash_passwords(raw_passwords):
+    """
+    Return the hashes of the passwords with the preferred hasher. Used by the
+    worker processes of bulk provisioning.
+    """
+    return [make_password(raw_password) for raw_password in raw_passwords]
+
+
+def verify_password(raw_password, encoded):
+    """
+    Check the password against the hash. Returns whether it matches and, if the
+    hash is outdated, e.g. PBKDF2 while scrypt is preferred, a new hash of it.
+    """
+    rehashed = []
+    valid = check_password(raw_password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return valid, (rehashed[0] if rehashed else None)
+
+
+async def aauthenticate(request=None, email=None, password=None):
+    """
+    Async counterpart of `authenticate` for ModelBackend, the only configured
+    backend, with the hashing done in the hashing pool.
+
+    Returns the active user with the given email and password, or None.
+    Outdated hashes are replaced on a successful login. Like ModelBackend, a
+    password is hashed for unknown emails too, so response times don't reveal
+    which emails are registered.
+    """
+    UserModel = get_user_model()
+    user = None
+    if email is not None and password is not None:
+        try:
+            user = await UserModel._default_manager.aget(**{UserModel.USERNAME_FIELD: email})
+        except UserModel.DoesNotExist:
+            await ahash_password(password)
+        else:
+            valid, rehashed = await get_hashing_pool().run(verify_password, password, user.password)
+            if rehashed:
+                user.password = rehashed
+                await user.asave(update_fields=['password'])
+            if not valid or not user.is_active:
+                user = None
+    if user is None:
+        await user_login_failed.asend(sender=__name__, credentials={'email': email, 'password': '********************'}, request=request)
+        return None
+    user.backend = 'django.contrib.auth.backends.ModelBackend'
+    return user
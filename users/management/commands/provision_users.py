@@ -0,0 +1,45 @@
+import csv
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from users.provisioning import PROVISION_FIELDS, provision_users
+
+
+class Command(BaseCommand):
+    """
+    Management command creating many users and their contacts from a CSV file.
+
+    The CSV file needs a header row with the columns `email`, `username` and
+    `password`, `phone` is optional. Rows that can't be created are reported
+    with their line number and skipped, the other rows are created.
+
+    Usage::
+
+        python manage.py provision_users users.csv [--batch-size 500] [--workers 4]
+    """
+    help = 'Create users and their contacts in batches from a CSV file ("-" reads from stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with the columns ' + ', '.join(PROVISION_FIELDS))
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows inserted per batch.')
+        parser.add_argument('--workers', type=int, default=None, help='Processes hashing passwords, all CPUs by default.')
+
+
+    def handle(self, *args, **options):
+        try:
+            file = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f'Cannot read {options["path"]}: {exc}')
+
+        with file:
+            reader = csv.DictReader(file)
+            missing = {'email', 'username', 'password'} - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f'Missing columns: {", ".join(sorted(missing))}')
+            rows = ({key.strip(): value for key, value in row.items() if key} for row in reader)
+            users, errors = provision_users(rows, batch_size=options['batch_size'], workers=options['workers'])
+
+        for error in errors:
+            # line 1 is the header
+            messages = '; '.join(f'{field}: {" ".join(field_errors)}' for field, field_errors in error['errors'].items())
+            self.stderr.write(f'Line {error["index"] + 2}: {messages}')
+        self.stdout.write(self.style.SUCCESS(f'Created {len(users)} users, skipped {len(errors)} rows.'))
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import  BaseUserManager, AbstractBaseUser, PermissionsMixin
 from .utils import generate_initials
+from .hashing import ahash_password
 
 class CustomUserManager(BaseUserManager):
     """
@@ -10,16 +11,16 @@ class CustomUserManager(BaseUserManager):
         create_user(email, password=None, username=None, **extra_fields):
             Creates and returns a regular user with an email, password and username.
 
+        acreate_user(email, password=None, username=None, **extra_fields):
+            Async counterpart of create_user, hashing the password in the password hashing pool.
+
         create_superuser(email, password=None, username=None, **extra_fields):
             Creates and returns a superuser with the given email, password and username.
     """
     
-    def create_user(self, email, password=None, username=None, **extra_fields):
+    def build_user(self, email, password=None, username=None, **extra_fields):
         """
-        Create and return a regular user with an email, username, and password.
-
-        Returns:
-            CustomUser: The created user instance.
+        Validate the arguments of create_user and return the unsaved user without password.
         """
         if not email:
             raise ValueError("The given email must be set")
@@ -28,11 +29,34 @@ class CustomUserManager(BaseUserManager):
         if not password:
             raise ValueError("The given password must be set")
         initials = generate_initials(username=username)
-        user = self.model(email=self.normalize_email(email), username=username, initials=initials, **extra_fields)
+        return self.model(email=self.normalize_email(email), username=username, initials=initials, **extra_fields)
+    
+    def create_user(self, email, password=None, username=None, **extra_fields):
+        """
+        Create and return a regular user with an email, username, and password.
+
+        Returns:
+            CustomUser: The created user instance.
+        """
+        user = self.build_user(email, password, username, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
         return user
     
+    async def acreate_user(self, email, password=None, username=None, **extra_fields):
+        """
+        Create and return a regular user like create_user, hashing the password
+        in the password hashing pool instead of the calling thread.
+
+        Returns:
+            CustomUser: The created user instance.
+        """
+        user = self.build_user(email, password, username, **extra_fields)
+        user.password = await ahash_password(password)
+        user._password = password
+        await user.asave(using=self._db)
+        return user
+    
     def create_superuser(self, email, password=None, username=None, **extra_fields):
         """
         Create and return a superuser with the given email, username, and password.
@@ -40,11 +64,9 @@ class CustomUserManager(BaseUserManager):
         Returns:
             CustomUser: The created superuser instance.
         """
-        user = self.create_user(email=email, password=password, username=username, **extra_fields)
-        user.is_superuser = True
-        user.is_staff = True
-        user.save(using=self._db)
-        return user
+        extra_fields.setdefault('is_superuser', True)
+        extra_fields.setdefault('is_staff', True)
+        return self.create_user(email=email, password=password, username=username, **extra_fields)
 
 
 class CustomUser(AbstractBaseUser, PermissionsMixin):
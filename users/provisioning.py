@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from contacts.models import Contact
+from .hashing import hash_passwords, setup_worker
+from .models import CustomUser
+from .utils import generate_initials
+
+PROVISION_FIELDS = ['email', 'username', 'password', 'phone']
+
+
+def build_user(row):
+    """
+    Return the unsaved user for a row with email, username, password and an
+    optional phone number, validated like the model fields.
+    The password is left to be hashed with the rest of the batch.
+    """
+    user = CustomUser(
+        email=CustomUser.objects.normalize_email(row.get('email') or ''),
+        username=row.get('username') or '',
+        phone=row.get('phone') or None,
+        initials=generate_initials(row.get('username')),
+    )
+    errors = {}
+    try:
+        user.clean_fields(exclude=['password', 'last_login'])
+    except ValidationError as exc:
+        errors = exc.message_dict
+    if not row.get('password'):
+        errors['password'] = ['This field cannot be blank.']
+    if errors:
+        raise ValidationError(errors)
+    return user
+
+
+def split(items, parts):
+    """
+    Split the list into up to `parts` consecutive slices of about the same size.
+    """
+    size = -(-len(items) // parts)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def email_taken_error(index, user):
+    """
+    Return the error reported for a row whose email belongs to an existing user.
+    """
+    return {'index': index, 'errors': {'email': user.unique_error_message(CustomUser, ['email']).messages}}
+
+
+def provision_users(rows, batch_size=500, workers=None):
+    """
+    Create users and their contacts from an iterable of dicts with the keys of
+    PROVISION_FIELDS, in batches of `batch_size` rows.
+
+    The result matches create_user followed by the create_user_contact signal
+    handler: the same initials, a Contact with name, email and initials of the
+    user and a random badge color. Users and contacts are inserted with one
+    bulk_create each per batch, inside a transaction, and Contact's
+    post_bulk_save keeps the change log and event stream up to date.
+
+    The passwords of a batch are hashed in `workers` processes, all CPUs by
+    default; with `workers=1` they are hashed in the calling process.
+
+    Rows that are invalid or whose email is already taken, by an existing user
+    or an earlier row, are skipped and reported with their index and errors.
+    If an email is taken while a batch is hashed, the batch is inserted again
+    without the rows of the taken emails.
+
+    Returns:
+        tuple: The list of created users and the list of errors.
+    """
+    workers = workers or os.cpu_count()
+    executor = ProcessPoolExecutor(workers, initializer=setup_worker) if workers > 1 else None
+    created = []
+    errors = []
+    seen_emails = set()
+    rows = enumerate(rows)
+    try:
+        while batch := list(islice(rows, batch_size)):
+            pending = []
+            for index, row in batch:
+                try:
+                    user = build_user(row)
+                except ValidationError as exc:
+                    errors.append({'index': index, 'errors': exc.message_dict})
+                    continue
+                if user.email in seen_emails:
+                    errors.append({'index': index, 'errors': {'email': ['Duplicate email in the provisioned rows.']}})
+                    continue
+                seen_emails.add(user.email)
+                pending.append((index, user, row['password']))
+
+            existing = set(CustomUser.objects.filter(email__in=[user.email for _, user, _ in pending]).values_list('email', flat=True))
+            accepted = []
+            passwords = []
+            for index, user, password in pending:
+                if user.email in existing:
+                    errors.append(email_taken_error(index, user))
+                else:
+                    accepted.append((index, user))
+                    passwords.append(password)
+            if not accepted:
+                continue
+
+            if executor:
+                hashes = [encoded for part in executor.map(hash_passwords, split(passwords, workers)) for encoded in part]
+            else:
+                hashes = hash_passwords(passwords)
+            for (_, user), encoded in zip(accepted, hashes):
+                user.password = encoded
+
+            while accepted:
+                users = [user for _, user in accepted]
+                try:
+                    with transaction.atomic():
+                        users = CustomUser.objects.bulk_create(users)
+                        Contact.objects.bulk_create([
+                            Contact(name=user.username, email=user.email, active_user=user) for user in users
+                        ])
+                except IntegrityError:
+                    # an email was taken after the check above, e.g. by a registration
+                    taken = set(CustomUser.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True))
+                    if not taken:
+                        raise
+                    for index, user in accepted:
+                        # the rolled back insert may have set them
+                        user.pk = None
+                        user._state.adding = True
+                        if user.email in taken:
+                            errors.append(email_taken_error(index, user))
+                    accepted = [(index, user) for index, user in accepted if user.email not in taken]
+                    continue
+                created += users
+                break
+    finally:
+        if executor:
+            executor.shutdown()
+    return created, errors
@@ -1,12 +1,15 @@
 # serializers.py
 from rest_framework import serializers
+from join_backend.serializers import TimedSerializerMixin, ValuesSerializer
 from .models import CustomUser
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from .hashing import aauthenticate
 
 from django.contrib.auth import authenticate, get_user_model
 from django.utils.translation import gettext_lazy as _
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the CustomUser model, handling user data serialization and deserialization.
 
@@ -39,6 +42,14 @@ class CustomUserSerializer(serializers.ModelSerializer):
     
     
     
+class CustomUserValuesSerializer(ValuesSerializer):
+    """
+    Read-only serializer with the output of CustomUserSerializer, built from values rows.
+    """
+    fields = ['id', 'username', 'email', 'phone', 'initials']
+
+
+
 class CustomAuthTokenSerializer(serializers.Serializer):
     """
     Serializer for handling user authentication tokens.
@@ -51,6 +62,10 @@ class CustomAuthTokenSerializer(serializers.Serializer):
     Methods:
         validate(attrs):
             Validates the provided credentials and authenticates the user.
+        get_credentials(attrs):
+            Returns email and password, raising if one is missing.
+        check_user(user):
+            Returns the authenticated user, raising if authentication failed.
     """
     
     email = serializers.EmailField(
@@ -72,25 +87,68 @@ class CustomAuthTokenSerializer(serializers.Serializer):
         """
         Validate the provided email and password, and authenticate the user.
         """
+        email, password = self.get_credentials(attrs)
+        user = authenticate(request=self.context.get('request'),
+                            email=email, password=password)
+        attrs['user'] = self.check_user(user)
+        return attrs
+    
+    
+    def get_credentials(self, attrs):
+        """
+        Return email and password, which are both required.
+        """
         email = attrs.get('email')
         password = attrs.get('password')
-
-        if email and password:
-            user = authenticate(request=self.context.get('request'),
-                                email=email, password=password)
-
-            # The authenticate call simply returns None for is_active=False
-            # users. (Assuming the default ModelBackend authentication
-            # backend.)
-            if not user:
-                msg = _('Unable to log in with provided credentials.')
-                raise serializers.ValidationError(msg, code='authorization')
-        else:
+        if not (email and password):
             msg = _('Must include "email" and "password".')
             raise serializers.ValidationError(msg, code='authorization')
+        return email, password
+    
+    
+    def check_user(self, user):
+        """
+        Return the authenticated user or raise if authentication failed.
+        """
+        # The authenticate call simply returns None for is_active=False
+        # users. (Assuming the default ModelBackend authentication
+        # backend.)
+        if not user:
+            msg = _('Unable to log in with provided credentials.')
+            raise serializers.ValidationError(msg, code='authorization')
+        return user
+
+
 
-        attrs['user'] = user
+class AsyncAuthTokenSerializer(CustomAuthTokenSerializer):
+    """
+    CustomAuthTokenSerializer for async views, checking the password in the
+    password hashing pool instead of the calling thread.
+
+    Methods:
+        validate(attrs):
+            Validates that email and password are provided, without authenticating.
+        aauthenticate():
+            Authenticates the user after validation and adds it to `validated_data`.
+    """
+    
+    def validate(self, attrs):
+        self.get_credentials(attrs)
         return attrs
+    
+    
+    async def aauthenticate(self):
+        """
+        Authenticate the validated email and password and return the user.
+        Raises the same validation error as CustomAuthTokenSerializer on failure.
+        """
+        user = await aauthenticate(request=self.context.get('request'),
+                                   email=self.validated_data['email'], password=self.validated_data['password'])
+        try:
+            self.validated_data['user'] = self.check_user(user)
+        except ValidationError as exc:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: exc.detail})
+        return user
 
 
 
@@ -106,6 +164,8 @@ class RegisterSerializer(serializers.ModelSerializer):
     Methods:
         create(validated_data):
             Creates a new CustomUser instance with the validated data.
+        asave():
+            Async counterpart of `save`, hashing the password in the password hashing pool.
     """
     class Meta: 
         model = CustomUser
@@ -126,4 +186,16 @@ class RegisterSerializer(serializers.ModelSerializer):
         user = CustomUser.objects.create_user(email=email, password=password, username=username)
         return user
     
+    
+    async def asave(self):
+        """
+        Async counterpart of `save` for new users, hashing the password in the
+        password hashing pool.
+
+        Returns:
+            CustomUser: The newly created user instance.
+        """
+        self.instance = await CustomUser.objects.acreate_user(**self.validated_data)
+        return self.instance
+    
     
\ No newline at end of file
@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
 from contacts.models import Contact
 from .models import CustomUser
+from .authentication import TOKEN_CACHE_ALIAS, token_cache_key, invalidate_cached_tokens
 import random
 
 @receiver(post_save, sender=CustomUser)
@@ -13,4 +16,25 @@ def create_user_contact(sender, instance, created, **kwargs):
     """
     if created:
         Contact.objects.create(name=instance.username, email=instance.email, initials=instance.initials, badge_color=random.randint(1,15), active_user=instance)
-        
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """
+    Signal handler that is triggered after a User instance is saved.
+
+    This function removes the cached tokens of the user, so a password change or
+    deactivation, e.g. in CustomUserSerializer.update, takes effect immediately.
+    """
+    if not created:
+        invalidate_cached_tokens(instance)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Signal handler that is triggered after a Token instance is deleted.
+
+    This function removes the token from the token cache.
+    """
+    caches[TOKEN_CACHE_ALIAS].delete(token_cache_key(instance.key))
@@ -1,10 +1,24 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
 from .models import CustomUser
 from rest_framework.authtoken.models import Token
 from .utils import generate_initials
+from .authentication import CachedTokenAuthentication
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from asgiref.sync import async_to_sync
+from unittest.mock import patch
+from .hashing import HashingPool, hash_passwords
+from .provisioning import provision_users
+from contacts.models import Contact
+from django.core.management import call_command
+import io
+import os
+import tempfile
 
 # Create your tests here.
 class UserModelTest(TestCase):
@@ -64,9 +78,13 @@ class CustomUserViewSetTests(APITestCase):
         url = reverse('user-list')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]['username'], 'user1')
-        self.assertEqual(response.data[1]['username'], 'user2')
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['username'], 'user1')
+        self.assertEqual(response.data['results'][1]['username'], 'user2')
+        
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            fast_response = self.client.get(url, format='json')
+        self.assertEqual(fast_response.content, response.content)
         
     
     def test_get_user_detail(self):
@@ -259,8 +277,59 @@ class LoginViewTests(APITestCase):
         url = reverse('user-list')
         response = self.client.get(url, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
+        
+        
+        
+class CachedTokenAuthenticationTests(APITestCase):
+    
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testuser', email='test@mail.de', password='testpassword')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('user-detail', kwargs={'pk': self.user.pk})
+        
+        
+    def test_token_is_cached(self):
+        """
+        Ensure the token is only looked up in the database on the first request.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in queries if 'authtoken_token' in query['sql']])
+        
+        
+    def test_deleted_token_is_rejected(self):
+        """
+        Ensure a cached token can't be used anymore after it was deleted.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        
+    def test_deactivated_user_is_rejected(self):
+        """
+        Ensure a cached token can't be used anymore after its user was deactivated.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        
         
+    def test_cached_user_is_refreshed_after_password_change(self):
+        """
+        Ensure the cached user is refreshed after the user changed the password.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        response = self.client.patch(self.url, {'password': 'newpassword'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cached_user, _ = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertTrue(cached_user.check_password('newpassword'))
         
 
 class RegisterViewTests(APITestCase):
@@ -300,4 +369,206 @@ class RegisterViewTests(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(CustomUser.objects.count(), 1)
-    
\ No newline at end of file
+            
+        
+    def test_register_hashes_with_scrypt(self):
+        """
+        Ensure new passwords are hashed with the preferred scrypt hasher.
+        """
+        data = {'email': 'user1@mail.de', 'password': 'password1', 'username': 'user1'}
+        response = self.client.post(reverse('register'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(CustomUser.objects.get(email='user1@mail.de').password.startswith('scrypt$'))
+        
+        
+        
+class PasswordHashingTests(APITestCase):
+    
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testuser', email='test@mail.de', password='testpassword')
+        self.url = reverse('login')
+        self.data = {'email': 'test@mail.de', 'password': 'testpassword'}
+        
+        
+    def test_login_rehashes_outdated_hash(self):
+        """
+        Ensure a PBKDF2 hash is replaced with a scrypt hash on login.
+        """
+        self.user.password = make_password('testpassword', hasher='pbkdf2_sha256')
+        self.user.save()
+        response = self.client.post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        self.assertTrue(self.user.check_password('testpassword'))
+        
+        
+    def test_failed_login_keeps_outdated_hash(self):
+        """
+        Ensure a wrong password doesn't replace the hash.
+        """
+        self.user.password = make_password('testpassword', hasher='pbkdf2_sha256')
+        self.user.save()
+        response = self.client.post(self.url, {**self.data, 'password': 'wrongpassword'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['non_field_errors'][0].code, 'authorization')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        
+        
+    def test_inactive_user_cant_login(self):
+        """
+        Ensure inactive users can't log in.
+        """
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('token', response.data)
+        
+        
+    def test_failed_login_sends_signal(self):
+        """
+        Ensure user_login_failed is sent for unknown emails, without the password.
+        """
+        failed = []
+        handler = lambda sender, credentials, **kwargs: failed.append(credentials)
+        user_login_failed.connect(handler)
+        try:
+            response = self.client.post(self.url, {**self.data, 'email': 'unknown@mail.de'}, format='json')
+        finally:
+            user_login_failed.disconnect(handler)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(failed, [{'email': 'unknown@mail.de', 'password': '********************'}])
+        
+        
+    def test_busy_pool_answers_503(self):
+        """
+        Ensure logins are answered with 503 and Retry-After while the hashing pool is full.
+        """
+        with patch('users.hashing.get_hashing_pool', return_value=HashingPool(max_workers=1, max_pending=0)):
+            response = self.client.post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        
+        
+    def test_pool_frees_slots(self):
+        """
+        Ensure the pool frees the slot of a hash after it is done, also if it failed.
+        """
+        pool = HashingPool(max_workers=1, max_pending=1)
+        self.assertEqual(async_to_sync(pool.run)(make_password, 'password').split('$')[0], 'scrypt')
+        with self.assertRaises(TypeError):
+            async_to_sync(pool.run)(make_password, object())
+        self.assertEqual(pool.pending, 0)
+        
+        
+        
+class ProvisioningTests(APITestCase):
+    
+    rows = [
+        {'email': 'anna@MAIL.DE', 'username': 'Anna Berg', 'password': 'password1', 'phone': '0123'},
+        {'email': 'ben@mail.de', 'username': 'ben', 'password': 'password2'},
+    ]
+    
+    def test_provisioned_users_match_create_user(self):
+        """
+        Ensure provisioned users and contacts equal those of create_user and the contact signal.
+        """
+        users, errors = provision_users(self.rows, workers=1)
+        self.assertEqual(errors, [])
+        for row, user in zip(self.rows, users):
+            expected = CustomUser.objects.create_user(email=row['email'].replace('@', '.copy@'), username=row['username'], password=row['password'], phone=row.get('phone'))
+            user = CustomUser.objects.get(pk=user.pk)
+            self.assertEqual(user.email, expected.email.replace('.copy@', '@'))
+            for field in ('username', 'initials', 'phone', 'is_active', 'is_staff', 'is_superuser'):
+                self.assertEqual(getattr(user, field), getattr(expected, field))
+            self.assertTrue(user.check_password(row['password']))
+            self.assertEqual(user.password.split('$')[0], expected.password.split('$')[0])
+            for field in ('name', 'initials', 'phone'):
+                self.assertEqual(getattr(user.contact, field), getattr(expected.contact, field))
+            self.assertEqual(user.contact.email, user.email)
+            self.assertIn(user.contact.badge_color, range(15))
+            
+            
+    def test_provisioning_uses_bulk_queries(self):
+        """
+        Ensure a batch takes a constant number of queries.
+        """
+        rows = [{'email': f'user{i}@mail.de', 'username': f'User {i}', 'password': 'password'} for i in range(20)]
+        with CaptureQueriesContext(connection) as queries:
+            users, errors = provision_users(rows, batch_size=10, workers=1)
+        self.assertEqual(len(users), 20)
+        self.assertEqual(Contact.objects.filter(active_user__in=users).count(), 20)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT') and 'users_customuser' in query['sql']]
+        self.assertEqual(len(inserts), 2)
+        
+        
+    def test_provisioning_reports_invalid_rows(self):
+        """
+        Ensure invalid rows and taken emails are skipped and reported, the other rows created.
+        """
+        CustomUser.objects.create_user(email='taken@mail.de', username='taken', password='password')
+        rows = [
+            {'email': 'taken@mail.de', 'username': 'again', 'password': 'password'},
+            {'email': 'no email', 'username': 'user', 'password': 'password'},
+            {'email': 'new@mail.de', 'username': '', 'password': ''},
+            {'email': 'new@mail.de', 'username': 'new', 'password': 'password'},
+            {'email': 'new@mail.de', 'username': 'new again', 'password': 'password'},
+        ]
+        users, errors = provision_users(rows, workers=1)
+        self.assertEqual([user.email for user in users], ['new@mail.de'])
+        self.assertEqual([error['index'] for error in errors], [1, 2, 4, 0])
+        self.assertEqual(set(errors[1]['errors']), {'username', 'password'})
+        self.assertEqual(CustomUser.objects.count(), 2)
+        
+        
+    def test_provisioning_skips_emails_taken_during_the_batch(self):
+        """
+        Ensure an email registered while its batch is hashed is reported and the other rows are created.
+        """
+        def register_during_hashing(passwords):
+            CustomUser.objects.create_user(email='ben@mail.de', username='ben', password='password')
+            return hash_passwords(passwords)
+        
+        with patch('users.provisioning.hash_passwords', side_effect=register_during_hashing):
+            users, errors = provision_users(self.rows, workers=1)
+        self.assertEqual([user.email for user in users], ['anna@mail.de'])
+        self.assertEqual([error['index'] for error in errors], [1])
+        self.assertIn('email', errors[0]['errors'])
+        self.assertTrue(CustomUser.objects.filter(email='anna@mail.de', contact__isnull=False).exists())
+        self.assertEqual(Contact.objects.filter(email='ben@mail.de').count(), 1)
+        
+        
+    def test_provisioning_hashes_in_processes(self):
+        """
+        Ensure passwords hashed by worker processes are valid.
+        """
+        users, errors = provision_users(self.rows, workers=2)
+        self.assertEqual(len(users), 2)
+        for row, user in zip(self.rows, users):
+            self.assertTrue(CustomUser.objects.get(pk=user.pk).check_password(row['password']))
+            
+            
+    def test_provision_users_command(self):
+        """
+        Ensure the command creates the users of a CSV file and reports skipped lines.
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write('email,username,password\nanna@mail.de,Anna Berg,password1\ninvalid,Ben,password2\n')
+        self.addCleanup(os.remove, file.name)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('provision_users', file.name, workers=1, stdout=stdout, stderr=stderr)
+        self.assertIn('Created 1 users, skipped 1 rows.', stdout.getvalue())
+        self.assertIn('Line 3: email:', stderr.getvalue())
+        self.assertTrue(CustomUser.objects.filter(email='anna@mail.de', contact__name='Anna Berg').exists())
+        
+        
+    def test_create_superuser_saves_once(self):
+        """
+        Ensure create_superuser inserts the user with a single query.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            user = CustomUser.objects.create_superuser(email='admin@mail.de', username='admin', password='password')
+        self.assertTrue(user.is_superuser and user.is_staff)
+        self.assertEqual(len([query for query in queries if 'users_customuser' in query['sql']]), 1)
@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .permissions import IsSelfOrReadOnly
@@ -7,13 +8,14 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.generics import CreateAPIView
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
+from join_backend.mixins import AsyncPostMixin, ReplicaReadMixin, ValuesListMixin
 
-from .serializers import CustomUserSerializer , CustomAuthTokenSerializer, RegisterSerializer
+from .serializers import CustomUserSerializer , AsyncAuthTokenSerializer, RegisterSerializer, CustomUserValuesSerializer
 from .models import CustomUser
 from rest_framework import status
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(ReplicaReadMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for handling CRUD operations on CustomUser instances.
 
@@ -22,8 +24,9 @@ class CustomUserViewSet(viewsets.ModelViewSet):
     """
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
+    values_serializer_class = CustomUserValuesSerializer
     permission_classes = [IsAuthenticated, IsSelfOrReadOnly]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     http_method_names = ['get', 'put', 'patch', 'delete', 'head', 'options', 'trace']
     
     def create(self, request, *args, **kwargs):
@@ -33,24 +36,26 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         raise PermissionDenied("Creating new users is not allowed here.")
     
     
-class LoginView(ObtainAuthToken):
+class LoginView(AsyncPostMixin, ObtainAuthToken):
     """
     View for handling user authentication and token generation.
 
-    Inherits from ObtainAuthToken to handle token-based authentication.
+    Inherits from ObtainAuthToken to handle token-based authentication. POST
+    requests are served asynchronously and the password is checked in the
+    password hashing pool, so a burst of logins doesn't block other requests.
 
     Methods:
-        post(request, *args, **kwargs):
+        apost(request, *args, **kwargs):
             Authenticates the user with the provided credentials and returns a token.
             - If authentication is successful, returns user ID, token, and email.
             - If authentication fails, raises a validation error.
     """
-    def post(self, request, *args, **kwargs):
-        serializer = CustomAuthTokenSerializer(data=request.data,
-                                           context={'request': request})
+    async def apost(self, request, *args, **kwargs):
+        serializer = AsyncAuthTokenSerializer(data=request.data,
+                                              context={'request': request})
         serializer.is_valid(raise_exception=True)
-        user = serializer.validated_data['user']
-        token, created = Token.objects.get_or_create(user=user)
+        user = await serializer.aauthenticate()
+        token, created = await Token.objects.aget_or_create(user=user)
         return Response({
             'id' : user.id,
             'token': token.key,
@@ -58,17 +63,19 @@ class LoginView(ObtainAuthToken):
         })
         
 
-class RegisterView(CreateAPIView):
+class RegisterView(AsyncPostMixin, CreateAPIView):
     """
     View for user registration.
 
-    Provides an endpoint for creating new user accounts.
+    Provides an endpoint for creating new user accounts. POST requests are
+    served asynchronously and the password is hashed in the password hashing
+    pool.
 
     Permissions:
         - `AllowAny`: Allows any user (authenticated or not) to access this endpoint.
 
     Methods:
-        post(request):
+        apost(request):
             Registers a new user with the provided data.
             - If the registration is successful, returns a success message.
             - If registration fails (e.g., validation errors), returns error details.
@@ -77,9 +84,10 @@ class RegisterView(CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [AllowAny]
     
-    def post(self, request):
+    async def apost(self, request):
         serializer = RegisterSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
+        # the unique validator of the email queries the database
+        if await sync_to_async(serializer.is_valid)():
+            await serializer.asave()
             return Response({"message": "User successfully registered"}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file